@@ -1,7 +1,11 @@
+import json
 import os
+import time
+
 import pygame
 
 ASSET_DIR = os.path.join(os.path.dirname(__file__), "assets")
+FONT_CACHE_FILE = os.path.join(os.path.dirname(__file__), "font_cache.json")
 
 def load_image(path: str, scale=None) -> pygame.Surface:
     full = os.path.join(ASSET_DIR, path)
@@ -9,3 +13,132 @@ def load_image(path: str, scale=None) -> pygame.Surface:
     if scale is not None:
         img = pygame.transform.smoothscale(img, scale)
     return img
+
+
+# -------------------- CACHE --------------------
+
+# Wspólny dla całego procesu rejestr obrazków kluczowany (ścieżka, rozmiar).
+# Każdy plik jest wczytywany (load + convert_alpha + smoothscale) tylko raz,
+# restart gry dostaje te same powierzchnie, więc cache klatek pulsowania
+# (kluczowany sprite'em) też nie rośnie z każdą grą.
+class AssetCache:
+    def __init__(self):
+        self.surfaces = {}
+        self.load_time = 0.0
+        self.hits = 0
+
+    def get(self, path: str, scale=None) -> pygame.Surface:
+        key = (path, None if scale is None else tuple(scale))
+        surf = self.surfaces.get(key)
+        if surf is None:
+            t0 = time.perf_counter()
+            surf = load_image(path, scale)
+            self.load_time += time.perf_counter() - t0
+            self.surfaces[key] = surf
+        else:
+            self.hits += 1
+        return surf
+
+    def preload(self, specs):
+        # specs: (ścieżka, rozmiar), np. przy starcie zanim pojawi się menu
+        for path, scale in specs:
+            self.get(path, scale)
+
+    def clear(self):
+        self.surfaces.clear()
+        self.load_time = 0.0
+        self.hits = 0
+
+    def memory(self):
+        return sum(s.get_pitch() * s.get_height() for s in self.surfaces.values())
+
+    def report(self):
+        pulse = {id(f): f for frames in _PULSE_CACHE.values() for f in frames}
+        pulse_bytes = sum(f.get_pitch() * f.get_height() for f in pulse.values())
+        return (f"assets: {len(self.surfaces)} obrazków, {self.memory() / 1024:.1f} KiB, "
+                f"wczytywanie {self.load_time * 1000:.1f} ms, trafienia cache {self.hits}; "
+                f"klatki pulsowania: {len(pulse)}, {pulse_bytes / 1024:.1f} KiB")
+
+
+ASSETS = AssetCache()
+
+
+# -------------------- FONTY --------------------
+
+# SysFont przy każdym starcie skanuje fonty systemowe (fontconfig). Ścieżki
+# znalezionych plików (także "brak fontu") zapisujemy w font_cache.json,
+# więc kolejne starty tylko otwierają plik. Usunięcie pliku wymusza nowy skan.
+_FONTS = {}
+_FONT_PATHS = None
+
+
+def _font_paths():
+    global _FONT_PATHS
+    if _FONT_PATHS is None:
+        try:
+            with open(FONT_CACHE_FILE, "r", encoding="utf-8") as f:
+                _FONT_PATHS = dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            _FONT_PATHS = {}
+    return _FONT_PATHS
+
+
+def font_path(name: str, bold: bool = False):
+    paths = _font_paths()
+    key = f"{name}:{'bold' if bold else 'regular'}"
+    if key in paths and (paths[key] is None or os.path.exists(paths[key])):
+        return paths[key]
+
+    paths[key] = pygame.font.match_font(name, bold=bold)
+    try:
+        with open(FONT_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(paths, f, ensure_ascii=False, indent=2)
+    except OSError:
+        pass
+    return paths[key]
+
+
+def load_font(name: str, size: int, bold: bool = False) -> pygame.font.Font:
+    # odpowiednik pygame.font.SysFont, bez skanu fontów systemowych
+    key = (name, size, bold)
+    font = _FONTS.get(key)
+    if font is None:
+        path = font_path(name, bold)
+        font = pygame.font.Font(path, size)
+        # brak osobnego pliku pogrubionego: pogrubienie sztuczne, jak w SysFont
+        if bold and (path is None or path == font_path(name)):
+            font.set_bold(True)
+        _FONTS[key] = font
+    return font
+
+
+# -------------------- ANIMACJE --------------------
+
+# Klatki pulsowania (skalowania) sprite'a renderowane z góry, żeby draw()
+# robił zwykły blit zamiast smoothscale co klatkę.
+PULSE_STEPS = 16
+_PULSE_CACHE = {}
+
+
+def pulse_frames(sprite: pygame.Surface, amplitude: float, steps: int = PULSE_STEPS):
+    key = (sprite, amplitude, steps)
+    frames = _PULSE_CACHE.get(key)
+    if frames is None:
+        by_size = {}
+        frames = []
+        for i in range(steps):
+            s = 1.0 + amplitude * (2.0 * i / (steps - 1) - 1.0)
+            size = (int(sprite.get_width() * s), int(sprite.get_height() * s))
+            frame = by_size.get(size)
+            if frame is None:
+                frame = pygame.transform.smoothscale(sprite, size)
+                by_size[size] = frame
+            frames.append(frame)
+        _PULSE_CACHE[key] = frames
+    return frames
+
+
+def pulse_frame(sprite: pygame.Surface, amplitude: float, wave: float) -> pygame.Surface:
+    # wave w zakresie [-1, 1] (np. sin fazy animacji) -> najbliższa klatka
+    frames = pulse_frames(sprite, amplitude)
+    return frames[int((wave + 1.0) * 0.5 * (len(frames) - 1) + 0.5)]
@@ -0,0 +1,267 @@
+# Przegląd balansu fal: wiele gier bez okna na wszystkich rdzeniach
+# (siatka parametrów WaveManager / wież x układy wież x ziarna), wyniki
+# każdej fali w jednej tabeli CSV. Gry mają stałe ziarna, więc przebieg
+# z tymi samymi argumentami daje te same liczby.
+# Przykład: python balance_sweep.py --grid enemy_hp_per_wave=4,6,8 --grid Laser.damage=6,8
+#           --layout mix --layout laser --seeds 5 --max-waves 30 --out sweep.csv
+import argparse
+import csv
+import itertools
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from map_data import WAYPOINTS, tower_spots
+from simulation import Simulation, TOWER_TYPES
+from wave import WaveManager
+
+# wbudowane układy: kolejność budowy wież na miejscach najbliższych ścieżce
+LAYOUTS = {
+    "laser": ("Laser",) * 12,
+    "cannon": ("Cannon",) * 12,
+    "mix": ("Laser", "Cannon", "Slow") * 4,
+    "slow_laser": ("Slow", "Laser", "Laser") * 4,
+}
+
+# statystyki wieży, które można nadpisać kluczem "Rodzaj.pole"
+TOWER_STATS = ("range", "cooldown", "damage", "bullet_speed", "slow_factor", "slow_duration")
+
+# parametry fal, które muszą być liczbami całkowitymi: dzielniki (>= 1) i liczby przeciwników
+WAVE_DIVISORS = ("BOSS_EVERY", "ENEMY_REWARD_WAVE_DIV")
+WAVE_COUNTS = ("ENEMIES_BASE", "ENEMIES_PER_WAVE", "BOSS_ESCORTS")
+
+# leaks: przeciwnicy, którzy doszli do bazy w tej fali
+# hp_lost: hp bazy stracone w fali (boss zabiera BOSS_DAMAGE, nie 1)
+# timeout: 1, gdy fala nie skończyła się w limicie ticków (gra dalej nie idzie)
+# rejected: kroki skryptu odrzucone do tej pory, bo gracz nie mógłby tam budować
+COLUMNS = ("run", "params", "layout", "seed", "wave", "leaks", "hp_lost", "base_hp", "credits", "score", "towers",
+           "ticks", "timeout", "rejected")
+
+_SPRITES = (None, None, None)
+
+
+# -------------------- PARAMETRY --------------------
+
+def _number(text):
+    value = float(text)
+    return int(value) if value.is_integer() and "." not in text else value
+
+
+def parse_grid(items):
+    # ["enemy_hp_per_wave=4,6,8", "Laser.damage=6,8"] -> {"ENEMY_HP_PER_WAVE": [4, 6, 8], "Laser.damage": [6, 8]}
+    grid = {}
+    for item in items:
+        key, sep, values = item.partition("=")
+        if not sep or not values:
+            raise ValueError(f"oczekiwano klucz=w1,w2,...: {item}")
+        if "." in key:
+            mode, _, stat = key.partition(".")
+            if mode not in TOWER_TYPES or stat not in TOWER_STATS:
+                raise ValueError(f"nieznana statystyka wieży: {key}")
+        else:
+            key = key.upper()
+            if not is_wave_param(key):
+                raise ValueError(f"nieznany parametr WaveManager: {key}")
+        try:
+            grid[key] = [_number(v) for v in values.split(",")]
+        except ValueError:
+            raise ValueError(f"oczekiwano liczb: {item}") from None
+        for value in grid[key]:
+            check_value(key, value)
+    return grid
+
+
+def is_wave_param(key):
+    # tylko stałe balansu (WIELKIE_LITERY, liczby), nie metody ani stan instancji
+    value = getattr(WaveManager, key, None)
+    return key.isupper() and isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def check_value(key, value):
+    if not value >= 0:
+        raise ValueError(f"{key}: wartość nie może być ujemna: {value}")
+    if key in WAVE_DIVISORS + WAVE_COUNTS and not isinstance(value, int):
+        raise ValueError(f"{key}: oczekiwano liczby całkowitej: {value}")
+    if key in WAVE_DIVISORS and value < 1:
+        raise ValueError(f"{key}: wartość musi być co najmniej 1: {value}")
+
+
+def combinations(grid):
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def load_layout(path):
+    # skrypt z pliku JSON: [[fala, "Laser"|"Cannon"|"Slow"|"upgrade", x, y], ...]
+    with open(path, "r", encoding="utf-8") as f:
+        steps = [(int(w), str(action), float(x), float(y)) for w, action, x, y in json.load(f)]
+    for _, action, _, _ in steps:
+        if action != "upgrade" and action not in TOWER_TYPES:
+            raise ValueError(f"{path}: nieznana akcja {action}")
+    return sorted(steps, key=lambda s: s[0])
+
+
+# -------------------- JEDNA GRA --------------------
+
+def _init_worker(sprites):
+    global _SPRITES
+    if sprites:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        from game import load_sprites
+        _SPRITES = load_sprites(headless=True)
+
+
+def _apply_stats(tower, params):
+    for key, value in params.items():
+        mode, _, stat = key.partition(".")
+        if mode == tower.NAME and hasattr(tower, stat):
+            setattr(tower, stat, value)
+
+
+class _Player:
+    # wykonuje układ przed każdą falą: buduje, gdy stać, potem ulepsza po kolei
+    def __init__(self, sim, layout, params):
+        self.sim = sim
+        self.params = params
+        self.rejected = 0
+        if isinstance(layout, tuple):
+            self.script = None
+            self.order = list(layout)
+            self.spots = tower_spots(sim.build_mask)
+        else:
+            self.script = list(layout)
+
+    def _build(self, mode, pos):
+        # te same zasady miejsca co w grze (Game sprawdza can_build przed budową)
+        if not self.sim.can_build(pos):
+            return False
+        tower = self.sim.try_build_tower(pos, mode)
+        if tower is not None:
+            _apply_stats(tower, self.params)
+            self.sim.towers_changed()
+        return tower is not None
+
+    def before_wave(self, wave):
+        sim = self.sim
+        if self.script is not None:
+            # akcje, na które nie było stać, czekają na kolejne fale
+            pending = []
+            for step in self.script:
+                w, action, x, y = step
+                if w > wave:
+                    pending.append(step)
+                elif action == "upgrade":
+                    tower = sim.tower_at((x, y))
+                    if tower is None or not sim.try_upgrade(tower):
+                        pending.append(step)
+                elif not self.sim.can_build((x, y)):
+                    # na ścieżce, poza mapą albo za blisko innej wieży - krok odpada
+                    self.rejected += 1
+                elif not self._build(action, (x, y)):
+                    pending.append(step)
+            self.script = pending
+            return
+
+        while self.order:
+            mode = self.order[0]
+            if sim.credits < TOWER_TYPES[mode].COST:
+                return
+            while self.spots and not self._build(mode, self.spots.pop(0)):
+                pass
+            self.order.pop(0)
+        for tower in list(sim.towers):
+            sim.try_upgrade(tower)
+
+
+def run_game(task):
+    # jedna gra bez okna -> wiersze tabeli, po jednym na falę
+    run, params, layout_name, layout, seed, max_waves, backend = task
+    enemy_sprites, boss_sprite, tower_sprites = _SPRITES
+    sim = Simulation(WAYPOINTS, enemy_sprites=enemy_sprites, boss_sprite=boss_sprite,
+                     tower_sprites=tower_sprites, enemy_backend=backend, seed=seed)
+    wm = sim.wave_manager
+    for key, value in params.items():
+        if "." not in key:
+            setattr(wm, key, value)
+    player = _Player(sim, layout, params)
+
+    label = " ".join(f"{k}={v}" for k, v in params.items())
+    rows = []
+    for wave in range(1, max_waves + 1):
+        player.before_wave(wave)
+        hp, tick, leaked = sim.base_hp, sim.tick, sim.leaked
+        sim.run_wave()
+        # limit ticków run_wave: fala wciąż trwa, kolejnej nie da się zacząć
+        timeout = not sim.game_over and not sim.is_wave_finished()
+        rows.append((run, label, layout_name, seed, wave, sim.leaked - leaked, int(hp - sim.base_hp),
+                     int(sim.base_hp), int(sim.credits), int(sim.score), len(sim.towers), sim.tick - tick,
+                     int(timeout), player.rejected))
+        if sim.game_over or timeout:
+            break
+    return rows
+
+
+# -------------------- CLI --------------------
+
+def main():
+    ap = argparse.ArgumentParser(description="Przegląd balansu fal na wszystkich rdzeniach, bez okna")
+    ap.add_argument("--grid", action="append", default=[], metavar="KLUCZ=W1,W2",
+                    help="parametr WaveManager (np. enemy_hp_per_wave) albo statystyka wieży (np. Laser.damage)")
+    ap.add_argument("--layout", action="append", default=[],
+                    help=f"układ wież: {', '.join(LAYOUTS)} albo plik JSON ze skryptem budowy")
+    ap.add_argument("--seeds", type=int, default=3, help="ile ziaren na kombinację")
+    ap.add_argument("--seed", type=int, default=1, help="pierwsze ziarno")
+    ap.add_argument("--max-waves", type=int, default=30)
+    ap.add_argument("--backend", choices=("objects", "numpy"), default="objects")
+    ap.add_argument("--jobs", type=int, default=None, help="liczba procesów (domyślnie wszystkie rdzenie)")
+    ap.add_argument("--no-sprites", action="store_true", help="bez sprite'ów gry (inne promienie kolizji)")
+    ap.add_argument("--out", default=None, help="plik CSV z wynikami każdej fali")
+    args = ap.parse_args()
+
+    try:
+        grid = parse_grid(args.grid)
+        layouts = {}
+        for name in args.layout or ["mix"]:
+            layouts[name] = LAYOUTS[name] if name in LAYOUTS else load_layout(name)
+    except (ValueError, OSError) as e:
+        ap.error(str(e))
+
+    combos = combinations(grid)
+    tasks = []
+    for i, (params, (name, layout), seed) in enumerate(
+            itertools.product(combos, layouts.items(), range(args.seed, args.seed + args.seeds))):
+        tasks.append((i, params, os.path.basename(name), layout, seed, args.max_waves, args.backend))
+
+    jobs = args.jobs or os.cpu_count() or 1
+    print(f"{len(combos)} kombinacji x {len(layouts)} układów x {args.seeds} ziaren = {len(tasks)} gier, "
+          f"{jobs} procesów")
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(not args.no_sprites,)) as pool:
+        # wyniki w kolejności zadań, niezależnie od tego, który proces skończył pierwszy
+        results = list(pool.map(run_game, tasks, chunksize=1))
+    print(f"gotowe w {time.perf_counter() - t0:.1f} s")
+
+    if args.out:
+        with open(args.out, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            for rows in results:
+                writer.writerows(rows)
+
+    # podsumowanie: średnio po ziarnach dla każdej kombinacji i układu
+    summary = {}
+    for rows in results:
+        last = rows[-1]
+        survived = last[4] if last[7] > 0 and not last[12] else last[4] - 1
+        summary.setdefault((last[1], last[2]), []).append((survived, last[9]))
+    print(f"\n{'fale':>6} {'wynik':>8}  układ / parametry")
+    for (label, layout), runs in sorted(summary.items(), key=lambda kv: -statistics.mean(r[0] for r in kv[1])):
+        waves = statistics.mean(r[0] for r in runs)
+        score = statistics.mean(r[1] for r in runs)
+        print(f"{waves:>6.1f} {score:>8.0f}  {layout} {label}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Alokacje na tick w długiej fali: z pulami obiektów i bez nich.
+# Liczy nowe obiekty encji (Enemy/Bullet/Beam), przebiegi GC i bloki pamięci.
+# Uruchomienie: python benchmarks/bench_alloc.py [--ticks 6000]
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation import Simulation
+from pool import pool_stats, set_pooling, _POOLS
+
+LAYOUT = [
+    ((300, 250), "Laser"), ((330, 400), "Cannon"), ((520, 300), "Slow"),
+    ((560, 420), "Laser"), ((740, 340), "Cannon"), ((900, 340), "Laser"),
+    ((300, 60), "Laser"), ((520, 60), "Slow"), ((740, 180), "Cannon"),
+]
+
+
+def run(ticks, pooling, seed):
+    set_pooling(pooling)
+    for p in _POOLS.values():
+        p.clear()
+    random.seed(seed)
+
+    sim = Simulation()
+    sim.credits = 10 ** 6
+    sim.base_hp = 10 ** 6
+    for pos, mode in LAYOUT:
+        sim.try_build_tower(pos, mode)
+
+    collections = [0]
+
+    def on_gc(phase, info):
+        if phase == "start":
+            collections[0] += 1
+
+    gc.collect()
+    gc.callbacks.append(on_gc)
+    tracemalloc.start()
+    start_blocks = sys.getallocatedblocks()
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        if sim.is_wave_finished():
+            sim.start_next_wave()
+        sim.step()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.callbacks.remove(on_gc)
+
+    created = sum(c for c, _, _ in pool_stats().values())
+    reused = sum(r for _, r, _ in pool_stats().values())
+    return {
+        "created/tick": created / ticks,
+        "reused/tick": reused / ticks,
+        "gc runs/1k ticks": collections[0] * 1000 / ticks,
+        "net blocks": sys.getallocatedblocks() - start_blocks,
+        "peak KiB": peak / 1024,
+        "ms/tick": elapsed * 1000 / ticks,
+        "wave": sim.wave_manager.wave,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ticks", type=int, default=6000)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    rows = [("bez pul", run(args.ticks, False, args.seed)), ("z pulami", run(args.ticks, True, args.seed))]
+    keys = list(rows[0][1])
+    print(f"{'':>18}" + "".join(f"{name:>12}" for name, _ in rows))
+    for k in keys:
+        print(f"{k:>18}" + "".join(f"{r[k]:>12.2f}" if isinstance(r[k], float) else f"{r[k]:>12}" for _, r in rows))
+
+
+if __name__ == "__main__":
+    main()
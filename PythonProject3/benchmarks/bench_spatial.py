@@ -0,0 +1,71 @@
+# Porównanie Tower.pick_target: pełny skan listy vs siatka EnemyGrid.
+# Uruchomienie: python benchmarks/bench_spatial.py [--towers 50] [--enemies 2000]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from map_data import WAYPOINTS
+from entities import Enemy, CannonTower
+from spatial import EnemyGrid
+
+
+def make_enemies(n, rng):
+    enemies = []
+    for _ in range(n):
+        e = Enemy(WAYPOINTS, hp=100, speed=80, reward=1)
+        e.distance = rng.uniform(0, e.path.length)
+        x, y, e.wp_idx = e.path.position(e.distance)
+        e.pos.x = x + rng.uniform(-15, 15)
+        e.pos.y = y + rng.uniform(-15, 15)
+        enemies.append(e)
+    return enemies
+
+
+def make_towers(n, rng):
+    return [CannonTower((rng.uniform(40, 1060), rng.uniform(40, 610))) for _ in range(n)]
+
+
+def time_ticks(towers, enemies, grid, ticks):
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        if grid is not None:
+            grid.rebuild(enemies)
+        for t in towers:
+            t.pick_target(enemies, grid)
+    return (time.perf_counter() - t0) / ticks
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--towers", type=int, default=50)
+    ap.add_argument("--enemies", type=int, default=2000)
+    ap.add_argument("--ticks", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    towers = make_towers(args.towers, rng)
+
+    print(f"{args.towers} towers, {args.ticks} ticks per case")
+    print(f"{'enemies':>8} {'scan ms/tick':>13} {'grid ms/tick':>13} {'speedup':>8}")
+    counts = sorted({100, 500, 1000, args.enemies})
+    for n in counts:
+        enemies = make_enemies(n, rng)
+        grid = EnemyGrid()
+
+        # obie metody muszą wybrać ten sam cel
+        grid.rebuild(enemies)
+        for t in towers:
+            assert t.pick_target(enemies) is t.pick_target(enemies, grid)
+
+        scan = time_ticks(towers, enemies, None, args.ticks)
+        fast = time_ticks(towers, enemies, grid, args.ticks)
+        print(f"{n:>8} {scan * 1000:>13.2f} {fast * 1000:>13.2f} {scan / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+# Powtarzalne scenariusze wydajności: ticki/s symulacji (Simulation.step)
+# i klatki/s rysowania (Game.draw) pod SDL_VIDEODRIVER=dummy.
+# Wynik zapisywany jako JSON, dwa przebiegi można porównać i oznaczyć regresje.
+# Uruchomienie: python benchmarks/bench_suite.py [--out wynik.json] [--compare stary.json]
+#               [--backend objects|numpy] [--only t50] [--quick] [--no-draw] [--replay gra.tdr]
+#               [--state zapis.tds]
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from map_data import WAYPOINTS, get_path_table, tower_spots
+from entities import Enemy, BossEnemy
+from simulation import Simulation
+from replay import Replay, ReplayError
+from savegame import load_game, SaveError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# nazwa -> parametry scenariusza
+SCENARIOS = {}
+for _towers in (10, 50, 200):
+    for _enemies in (100, 1000, 10000):
+        SCENARIOS[f"t{_towers}_e{_enemies}"] = {"towers": _towers, "enemies": _enemies}
+SCENARIOS["boss_wave"] = {"towers": 50, "enemies": 300, "bosses": 20}
+SCENARIOS["bullet_field"] = {"towers": 120, "enemies": 1000, "kinds": ("Cannon", "Slow")}
+
+# metryki, w których większa wartość jest lepsza
+THROUGHPUT = ("update_tps", "draw_fps")
+
+
+def build(spec, backend, seed, sprites):
+    random.seed(seed)
+    rng = random.Random(seed)
+    enemy_sprites, boss_sprite, tower_sprites = sprites
+
+    sim = Simulation(WAYPOINTS, enemy_sprites=enemy_sprites, boss_sprite=boss_sprite,
+                     tower_sprites=tower_sprites, enemy_backend=backend)
+    sim.credits = 10 ** 9
+    sim.base_hp = 10 ** 9
+
+    kinds = spec.get("kinds", ("Laser", "Cannon", "Slow"))
+    for i, pos in enumerate(tower_spots(sim.build_mask)[:spec["towers"]]):
+        sim.try_build_tower(pos, kinds[i % len(kinds)])
+
+    # przeciwnicy rozłożeni wzdłuż ścieżki, z dużym hp, żeby ich liczba była stała
+    length = get_path_table(WAYPOINTS).length
+    for i in range(spec["enemies"] + spec.get("bosses", 0)):
+        if i < spec["enemies"]:
+            e = Enemy.acquire(WAYPOINTS, hp=10 ** 6, speed=rng.uniform(60, 90), reward=1)
+            if enemy_sprites:
+                e.set_sprite(enemy_sprites[i % len(enemy_sprites)])
+        else:
+            e = BossEnemy.acquire(WAYPOINTS, hp=10 ** 6, speed=70, reward=1, damage_to_base=5, tower_kill_cd=5.0)
+            if boss_sprite is not None:
+                e.set_sprite(boss_sprite)
+        e.distance = rng.uniform(0, length * 0.85)
+        e.pos.x, e.pos.y, e.wp_idx = e.path.position(e.distance)
+        e.prev_x, e.prev_y = e.pos.x, e.pos.y
+        sim.enemies.append(e)
+    return sim
+
+
+def measure_update(sim, ticks, warmup):
+    for _ in range(warmup):
+        sim.step()
+    times = []
+    for _ in range(ticks):
+        t0 = time.perf_counter()
+        sim.step()
+        times.append(time.perf_counter() - t0)
+    return {
+        "update_tps": len(times) / sum(times),
+        "update_ms_median": statistics.median(times) * 1000,
+        "update_ms_max": max(times) * 1000,
+        "enemies": len(sim.enemies),
+        "towers": len(sim.towers),
+        "bullets": len(sim.bullets),
+    }
+
+
+def measure_draw(game, sim, frames):
+    game.sim = sim
+    game.state = "PLAY"
+    game.selected_tower = None
+    game.build_mode = None
+    game.alpha = 1.0
+    game.draw()
+    times = []
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        game.draw()
+        times.append(time.perf_counter() - t0)
+    return {
+        "draw_fps": len(times) / sum(times),
+        "draw_ms_median": statistics.median(times) * 1000,
+    }
+
+
+def measure_replay(path, sprites):
+    # nagrana gra jako obciążenie: całe odtworzenie bez okna
+    replay = Replay.load(path)
+    sim = replay.new_simulation(sprites if replay.sprites else (None, None, None))
+    t0 = time.perf_counter()
+    replay.play(sim)
+    elapsed = time.perf_counter() - t0
+    return {
+        "update_tps": sim.tick / elapsed,
+        "ticks": sim.tick,
+        "enemies": len(sim.enemies),
+        "towers": len(sim.towers),
+        "bullets": len(sim.bullets),
+    }
+
+
+def compare(old, new, threshold):
+    # porównanie metryk przepustowości; zwraca liczbę regresji
+    regressions = 0
+    for key in ("backend", "ticks", "frames", "seed"):
+        if old.get("meta", {}).get(key) != new["meta"][key]:
+            print(f"uwaga: różne '{key}' w porównywanych przebiegach")
+    print(f"\n{'scenariusz':<16} {'metryka':<11} {'stary':>10} {'nowy':>10} {'zmiana':>8}")
+    for name, res in new["scenarios"].items():
+        prev = old.get("scenarios", {}).get(name)
+        if prev is None:
+            continue
+        for key in THROUGHPUT:
+            if key not in res or key not in prev:
+                continue
+            change = res[key] / prev[key] - 1.0
+            flag = ""
+            if change < -threshold:
+                flag = "REGRESJA"
+                regressions += 1
+            elif change > threshold:
+                flag = "poprawa"
+            print(f"{name:<16} {key:<11} {prev[key]:>10.1f} {res[key]:>10.1f} {change * 100:>7.1f}% {flag}")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--backend", choices=("objects", "numpy"), default="objects")
+    ap.add_argument("--ticks", type=int, default=120)
+    ap.add_argument("--warmup", type=int, default=30)
+    ap.add_argument("--frames", type=int, default=30)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--only", default=None, help="tylko scenariusze zawierające ten tekst")
+    ap.add_argument("--quick", action="store_true", help="krótsze pomiary (10 ticków, 5 klatek)")
+    ap.add_argument("--no-draw", action="store_true", help="tylko symulacja, bez Game.draw")
+    ap.add_argument("--replay", action="append", default=[], help="plik powtórki jako dodatkowy scenariusz")
+    ap.add_argument("--state", action="append", default=[], help="zapis gry (F5) jako dodatkowy scenariusz")
+    ap.add_argument("--out", default=None, help="plik JSON z wynikami")
+    ap.add_argument("--compare", default=None, help="wcześniejszy JSON do porównania")
+    ap.add_argument("--threshold", type=float, default=0.10, help="próg regresji (ułamek)")
+    args = ap.parse_args()
+
+    if args.quick:
+        args.ticks, args.warmup, args.frames = 10, 5, 5
+
+    game = None
+    sprites = (None, None, None)
+    if not args.no_draw:
+        from game import Game
+        game = Game()
+        game.reset_game()
+        sprites = (game.enemy_sprites, game.boss_sprite, game.tower_sprites)
+    elif args.replay or args.state:
+        from game import load_sprites
+        sprites = load_sprites(headless=True)
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pygame": pygame.version.ver,
+            "numpy": None if np is None else np.__version__,
+            "backend": args.backend,
+            "ticks": args.ticks,
+            "warmup": args.warmup,
+            "frames": 0 if args.no_draw else args.frames,
+            "seed": args.seed,
+        },
+        "scenarios": {},
+    }
+
+    print(f"backend {args.backend}, {args.ticks} ticków, {results['meta']['frames']} klatek")
+    print(f"{'scenariusz':<16} {'wież':>5} {'wrogów':>7} {'pocisków':>9} {'ticki/s':>9} {'klatki/s':>9}")
+    for name, spec in SCENARIOS.items():
+        if args.only and args.only not in name:
+            continue
+        sim = build(spec, args.backend, args.seed, sprites)
+        res = measure_update(sim, args.ticks, args.warmup)
+        if game is not None:
+            res.update(measure_draw(game, sim, args.frames))
+        results["scenarios"][name] = res
+        fps = f"{res['draw_fps']:>9.1f}" if "draw_fps" in res else f"{'-':>9}"
+        print(f"{name:<16} {res['towers']:>5} {res['enemies']:>7} {res['bullets']:>9} {res['update_tps']:>9.1f} {fps}")
+
+    for path in args.replay:
+        name = "replay:" + os.path.basename(path)
+        try:
+            res = measure_replay(path, sprites)
+        except (OSError, ReplayError) as e:
+            print(f"{name:<16} pominięty: {e}")
+            continue
+        results["scenarios"][name] = res
+        print(f"{name:<16} {res['towers']:>5} {res['enemies']:>7} {res['bullets']:>9} {res['update_tps']:>9.1f} {'-':>9}")
+
+    for path in args.state:
+        # gotowy stan z zapisu, np. późna fala, bez rozgrywania gry od początku
+        name = "state:" + os.path.basename(path)
+        try:
+            sim = load_game(path, *sprites)
+        except (OSError, SaveError) as e:
+            print(f"{name:<16} pominięty: {e}")
+            continue
+        res = measure_update(sim, args.ticks, args.warmup)
+        if game is not None:
+            res.update(measure_draw(game, sim, args.frames))
+        results["scenarios"][name] = res
+        fps = f"{res['draw_fps']:>9.1f}" if "draw_fps" in res else f"{'-':>9}"
+        print(f"{name:<16} {res['towers']:>5} {res['enemies']:>7} {res['bullets']:>9} {res['update_tps']:>9.1f} {fps}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            old = json.load(f)
+        if compare(old, results, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
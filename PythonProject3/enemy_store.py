@@ -0,0 +1,337 @@
+import random
+
+import pygame
+
+from entities import Enemy, BossEnemy
+from map_data import get_path_table
+from registry import INDEX_BITS
+
+try:
+    import numpy as np
+except ImportError:  # numpy jest opcjonalne, domyślny backend to zwykłe obiekty
+    np = None
+
+
+# -------------------- WIDOKI --------------------
+
+def _field(name):
+    def get(self):
+        return getattr(self.store, name)[self.slot].item()
+    return property(get)
+
+
+class EnemyView(Enemy):
+    # Lekki widok na jeden slot magazynu. Dziedziczy po Enemy tylko rysowanie
+    # i interfejs (take_damage, apply_slow), dane trzyma EnemyStore.
+    # Bez __slots__, żeby BossView mógł dziedziczyć też po BossEnemy.
+
+    def __init__(self, store, slot):
+        self.store = store
+        self.slot = slot
+        self.gen = int(store.gen[slot])
+
+    hp = _field("hp")
+    hp_max = _field("hp_max")
+    speed = _field("speed")
+    base_speed = _field("base_speed")
+    slow_factor = _field("slow_factor")
+    slow_timer = _field("slow_timer")
+    wp_idx = _field("wp_idx")
+    distance = _field("distance")
+    progress = _field("distance")
+    radius = _field("radius")
+    reward = _field("reward")
+    damage_to_base = _field("damage_to_base")
+    reached_base = _field("reached")
+    _bob_t = _field("bob_t")
+    prev_x = _field("prev_x")
+    prev_y = _field("prev_y")
+
+    @property
+    def handle(self):
+        # widok jest przypięty do (slot, gen), więc jego uchwyt się nie zmienia
+        return (self.gen << INDEX_BITS) | self.slot
+
+    @property
+    def alive(self):
+        s = self.store
+        return s.gen[self.slot] == self.gen and bool(s.alive[self.slot])
+
+    @property
+    def pos(self):
+        s = self.store
+        return pygame.Vector2(s.x[self.slot], s.y[self.slot])
+
+    def render_pos(self, alpha=1.0):
+        s = self.store
+        i = self.slot
+        return (s.prev_x[i] + (s.x[i] - s.prev_x[i]) * alpha,
+                s.prev_y[i] + (s.y[i] - s.prev_y[i]) * alpha)
+
+    @property
+    def sprite(self):
+        return self.store.sprites[self.slot]
+
+    def take_damage(self, dmg: float):
+        if self.alive:
+            self.store.take_damage(self.slot, dmg)
+
+    def apply_slow(self, factor: float, duration: float):
+        if self.alive:
+            self.store.apply_slow(self.slot, factor, duration)
+
+
+class BossView(EnemyView, BossEnemy):
+    is_boss = True
+
+    tower_kill_timer = _field("kill_timer")
+    tower_kill_cd = _field("kill_cd")
+    used_tower_kill = _field("kill_used")
+
+
+# -------------------- MAGAZYN --------------------
+
+# Przeciwnicy trzymani jako struktura tablic numpy (pozycja, hp, prędkość,
+# spowolnienie, odcinek i dystans na ścieżce). Ruch wszystkich liczony jest jednym
+# wektorowym krokiem na tick, a renderer i wieże dostają widoki EnemyView.
+class EnemyStore:
+    FLOAT_FIELDS = (
+        "x", "y", "prev_x", "prev_y", "hp", "hp_max", "base_speed", "speed", "slow_factor", "slow_timer",
+        "distance", "radius", "bob_t", "kill_timer", "kill_cd",
+    )
+    INT_FIELDS = ("wp_idx", "reward", "damage_to_base", "gen")
+    BOOL_FIELDS = ("used", "alive", "reached", "counted", "is_boss", "kill_used")
+
+    def __init__(self, waypoints, capacity=256):
+        if np is None:
+            raise ImportError("EnemyStore wymaga pakietu numpy")
+        self.waypoints = waypoints
+        path = get_path_table(waypoints)
+        self.path_length = path.length
+        self.path_end = path.end
+        self.seg_starts = np.asarray(path.starts, dtype=np.float64)
+        self.seg_origin = np.asarray(path.waypoints[:-1], dtype=np.float64).reshape(-1, 2)
+        self.seg_dir = np.asarray(path.dirs, dtype=np.float64).reshape(-1, 2)
+        self.capacity = 0
+        self.sprites = []
+        self.views = []
+        self.free = []
+        self.count = 0
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        old = self.capacity
+        for name in self.FLOAT_FIELDS:
+            self._resize(name, np.float64, capacity, old)
+        for name in self.INT_FIELDS:
+            self._resize(name, np.int64, capacity, old)
+        for name in self.BOOL_FIELDS:
+            self._resize(name, np.bool_, capacity, old)
+        self.sprites.extend([None] * (capacity - old))
+        self.views.extend([None] * (capacity - old))
+        self.free.extend(range(capacity - 1, old - 1, -1))
+        self.capacity = capacity
+
+    def _resize(self, name, dtype, capacity, old):
+        arr = np.zeros(capacity, dtype=dtype)
+        if old:
+            arr[:old] = getattr(self, name)
+        setattr(self, name, arr)
+
+    # -------------------- DODAWANIE / USUWANIE --------------------
+
+    def append(self, enemy):
+        # WaveManager tworzy zwykłe Enemy/BossEnemy, tutaj kopiujemy ich stan do tablic
+        if not self.free:
+            self._grow(self.capacity * 2)
+        i = self.free.pop()
+
+        self.x[i] = enemy.pos.x
+        self.y[i] = enemy.pos.y
+        self.prev_x[i] = enemy.prev_x
+        self.prev_y[i] = enemy.prev_y
+        self.hp[i] = enemy.hp
+        self.hp_max[i] = enemy.hp_max
+        self.base_speed[i] = enemy.base_speed
+        self.speed[i] = enemy.speed
+        self.slow_factor[i] = enemy.slow_factor
+        self.slow_timer[i] = enemy.slow_timer
+        self.distance[i] = enemy.distance
+        self.radius[i] = enemy.radius
+        self.bob_t[i] = enemy._bob_t
+        self.wp_idx[i] = enemy.wp_idx
+        self.reward[i] = enemy.reward
+        self.damage_to_base[i] = enemy.damage_to_base
+        self.used[i] = True
+        self.alive[i] = enemy.alive
+        self.reached[i] = enemy.reached_base
+        self.counted[i] = False
+
+        boss = getattr(enemy, "is_boss", False)
+        self.is_boss[i] = boss
+        if boss:
+            self.kill_timer[i] = enemy.tower_kill_timer
+            self.kill_cd[i] = enemy.tower_kill_cd
+            self.kill_used[i] = enemy.used_tower_kill
+        else:
+            self.kill_timer[i] = 0.0
+            self.kill_cd[i] = 0.0
+            self.kill_used[i] = False
+
+        self.sprites[i] = enemy.sprite
+        self.views[i] = (BossView if boss else EnemyView)(self, i)
+        self.count += 1
+
+        # stan jest już w tablicach, obiekt wraca do puli
+        enemy.release()
+        return self.views[i]
+
+    def extend(self, columns, sprites):
+        # wielu przeciwników naraz (wczytanie zapisu): kolumny o nazwach pól magazynu
+        n = len(sprites)
+        while len(self.free) < n:
+            self._grow(self.capacity * 2)
+        idx = [self.free.pop() for _ in range(n)]
+        slots = np.asarray(idx, dtype=np.int64)
+        for name, col in columns.items():
+            getattr(self, name)[slots] = col
+        self.used[slots] = True
+
+        views = []
+        for slot, sprite, boss in zip(idx, sprites, self.is_boss[slots].tolist()):
+            self.sprites[slot] = sprite
+            view = self.views[slot] = (BossView if boss else EnemyView)(self, slot)
+            views.append(view)
+        self.count += n
+        return views
+
+    def compact(self):
+        # zwalnia sloty martwych przeciwników; gen++ unieważnia stare widoki
+        dead = np.flatnonzero(self.used & ~self.alive)
+        if len(dead) == 0:
+            return
+        self.used[dead] = False
+        self.gen[dead] += 1
+        for i in dead.tolist():
+            self.sprites[i] = None
+            self.views[i] = None
+        self.free.extend(dead.tolist())
+        self.count -= len(dead)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        views = self.views
+        for i in np.flatnonzero(self.alive).tolist():
+            yield views[i]
+
+    # -------------------- EFEKTY --------------------
+
+    def take_damage(self, i, dmg):
+        self.hp[i] -= dmg
+        if self.hp[i] <= 0:
+            self.alive[i] = False
+
+    def apply_slow(self, i, factor, duration):
+        self.slow_factor[i] = min(self.slow_factor[i], factor)
+        self.slow_timer[i] = max(self.slow_timer[i], duration)
+
+    # -------------------- KROK --------------------
+
+    def update(self, dt):
+        a = np.flatnonzero(self.alive)
+        if len(a) == 0:
+            return
+
+        # spowolnienie
+        st = self.slow_timer[a] - dt
+        slowed = self.slow_timer[a] > 0
+        expired = slowed & (st <= 0)
+        self.slow_timer[a] = np.where(slowed, np.where(expired, 0.0, st), self.slow_timer[a])
+        self.slow_factor[a] = np.where(expired, 1.0, self.slow_factor[a])
+        self.speed[a] = self.base_speed[a] * self.slow_factor[a]
+
+        self.prev_x[a] = self.x[a]
+        self.prev_y[a] = self.y[a]
+
+        # do dotarcia przecinwka
+        d = self.distance[a] + self.speed[a] * dt
+        done = d >= self.path_length
+        if done.any():
+            gone = a[done]
+            self.distance[gone] = self.path_length
+            self.x[gone] = self.path_end[0]
+            self.y[gone] = self.path_end[1]
+            self.alive[gone] = False
+            self.reached[gone] = True
+            a = a[~done]
+            d = d[~done]
+            if len(a) == 0:
+                return
+
+        # pozycja z tabeli odcinków, reszta dystansu przechodzi na kolejny odcinek
+        seg = np.searchsorted(self.seg_starts, d, side="right") - 1
+        t = d - self.seg_starts[seg]
+        self.distance[a] = d
+        self.wp_idx[a] = seg
+        self.x[a] = self.seg_origin[seg, 0] + self.seg_dir[seg, 0] * t
+        self.y[a] = self.seg_origin[seg, 1] + self.seg_dir[seg, 1] * t
+
+        self.bob_t[a] += dt * 4.5
+
+        # bossowie: odliczanie do zniszczenia wieży
+        self.kill_timer[a] -= np.where(self.is_boss[a], dt, 0.0)
+
+    def try_destroy_random_tower(self, towers, rng=None):
+        # odpowiednik BossEnemy.try_destroy_random_tower dla wszystkich bossów naraz
+        victims = []
+        ready = np.flatnonzero(self.is_boss & self.alive & ~self.kill_used & (self.kill_timer <= 0))
+        for i in ready.tolist():
+            if not towers:
+                self.kill_timer[i] = self.kill_cd[i]
+                continue
+            victims.append((rng or random).choice(towers))
+            self.kill_used[i] = True
+        return victims
+
+    def collect_leaks(self):
+        # (obrażenia dla bazy, liczba przeciwników), którzy właśnie do niej dotarli
+        hit = np.flatnonzero(self.reached & ~self.alive & self.used)
+        if len(hit) == 0:
+            return 0, 0
+        self.reached[hit] = False
+        return int(self.damage_to_base[hit].sum()), len(hit)
+
+    def collect_kills(self):
+        # (nagroda, liczba zabitych) za przeciwników zabitych w tym ticku
+        killed = np.flatnonzero(self.used & ~self.alive & ~self.reached & ~self.counted & (self.hp <= 0))
+        if len(killed) == 0:
+            return 0, 0
+        self.counted[killed] = True
+        return int(self.reward[killed].sum()), len(killed)
+
+    # -------------------- ZAPYTANIA --------------------
+
+    def occupied_cells(self, cell_size):
+        # komórki siatki (jak w EnemyGrid) z co najmniej jednym żywym przeciwnikiem
+        a = self.alive
+        if not a.any():
+            return []
+        cx = np.trunc(self.x[a]).astype(np.int64) // cell_size + 32768
+        cy = np.trunc(self.y[a]).astype(np.int64) // cell_size + 32768
+        # sort + sąsiedzi zamiast np.unique (wolniejszego dla małych tablic)
+        keys = np.sort(cx * 65536 + cy)
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+        return list(zip((keys // 65536 - 32768).tolist(), (keys % 65536 - 32768).tolist()))
+
+    def best_in_range(self, x, y, r):
+        a = np.flatnonzero(self.alive)
+        if len(a) == 0:
+            return None
+        dx = self.x[a] - x
+        dy = self.y[a] - y
+        inside = a[dx * dx + dy * dy <= r * r]
+        if len(inside) == 0:
+            return None
+        return self.views[inside[np.argmax(self.distance[inside])]]
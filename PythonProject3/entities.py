@@ -2,6 +2,11 @@ import pygame
 import random
 from math import sqrt, sin
 
+from map_data import get_path_table
+from assets import pulse_frame
+from pool import Pooled
+from timers import EPS, countdown
+
 def dist(a, b):
     return sqrt((a[0]-b[0])**2 + (a[1]-b[1])**2)
 
@@ -11,10 +16,51 @@ def normalize(vx, vy):
         return 0.0, 0.0
     return vx/d, vy/d
 
+# -------------------- HEALTH BARS --------------------
+
+# Paski życia wyrenderowane z góry dla każdego poziomu wypełnienia (co piksel),
+# osobno dla stylu zwykłego i bossa. Rysowanie to jeden blit z cache,
+# a Game może zebrać wszystkie paski i narysować je jednym Surface.blits.
+_HEALTH_BARS = {}
+
+
+def health_bar_frames(size, colors):
+    key = (size, colors)
+    frames = _HEALTH_BARS.get(key)
+    if frames is None:
+        w, h = size
+        bg, fg, border = colors
+        frames = []
+        for fill in range(w + 1):
+            surf = pygame.Surface((w, h), pygame.SRCALPHA)
+            pygame.draw.rect(surf, bg, (0, 0, w, h), border_radius=3)
+            pygame.draw.rect(surf, fg, (0, 0, fill, h), border_radius=3)
+            pygame.draw.rect(surf, border, (0, 0, w, h), 1, border_radius=3)
+            frames.append(surf)
+        _HEALTH_BARS[key] = frames
+    return frames
+
 # -------------------- ENEMIES --------------------
 
-class Enemy:
-    def __init__(self, waypoints, hp, speed, reward, damage_to_base=1):
+class Enemy(Pooled):
+    BAR_SIZE = (34, 6)
+    BAR_COLORS = ((30, 30, 40), (80, 220, 120), (150, 150, 200))
+    BAR_OFFSET = 18
+
+    __slots__ = (
+        "waypoints", "hp_max", "hp", "base_speed", "speed", "reward", "damage_to_base",
+        "path", "distance", "wp_idx", "pos", "prev_x", "prev_y", "radius",
+        "slow_timer", "slow_factor", "alive", "reached_base", "sprite", "_bob_t", "_counted",
+        "handle",
+    )
+
+    def __init__(self, *args, **kwargs):
+        # uchwyt nadaje EntityRegistry, 0 = poza rejestrem
+        self.handle = 0
+        self.pos = pygame.Vector2()
+        self.reset(*args, **kwargs)
+
+    def reset(self, waypoints, hp, speed, reward, damage_to_base=1, rng=None):
         self.waypoints = waypoints
         self.hp_max = int(hp)
         self.hp = float(hp)
@@ -23,8 +69,14 @@ class Enemy:
         self.reward = int(reward)
         self.damage_to_base = int(damage_to_base)
 
+        # pozycja na ścieżce to jeden dystans od startu (długość łuku)
+        self.path = get_path_table(waypoints)
+        self.distance = 0.0
         self.wp_idx = 0
-        self.pos = pygame.Vector2(waypoints[0][0], waypoints[0][1])
+        self.pos.update(waypoints[0][0], waypoints[0][1])
+        # pozycja z poprzedniego kroku, do interpolacji przy rysowaniu
+        self.prev_x = self.pos.x
+        self.prev_y = self.pos.y
         self.radius = 12
 
 
@@ -33,13 +85,37 @@ class Enemy:
 
         self.alive = True
         self.reached_base = False
-
-
-        self.progress = 0.0
+        self._counted = False
 
 
         self.sprite = None
-        self._bob_t = random.random() * 6.28
+        # rng: strumień losowości symulacji (powtarzalne gry), domyślnie globalny random
+        self._bob_t = (rng or random).random() * 6.28
+
+    @property
+    def progress(self):
+        # klucz "najdalej na ścieżce" dla wież
+        return self.distance
+
+    def render_pos(self, alpha=1.0):
+        # pozycja między dwoma ostatnimi krokami symulacji
+        return (self.prev_x + (self.pos.x - self.prev_x) * alpha,
+                self.prev_y + (self.pos.y - self.prev_y) * alpha)
+
+    def draw_health_bar(self, screen, x, y, bars=None, skip_full=False):
+        # bars != None: zamiast rysować, dopisz (powierzchnia, pozycja) do wspólnej listy
+        frac = max(0.0, self.hp / self.hp_max)
+        if skip_full and frac >= 1.0:
+            return None
+        w, h = self.BAR_SIZE
+        frames = health_bar_frames(self.BAR_SIZE, self.BAR_COLORS)
+        surf = frames[min(w, int(w * frac))]
+        bx = x - w // 2
+        by = int(y - self.radius - self.BAR_OFFSET)
+        if bars is None:
+            return screen.blit(surf, (bx, by))
+        bars.append((surf, (bx, by)))
+        return pygame.Rect(bx, by, w, h)
 
     def set_sprite(self, sprite: pygame.Surface):
         self.sprite = sprite
@@ -66,55 +142,54 @@ class Enemy:
 
         self.speed = self.base_speed * self.slow_factor
 
+        self.prev_x = self.pos.x
+        self.prev_y = self.pos.y
+
         # do dotarcia przecinwka
-        if self.wp_idx >= len(self.waypoints) - 1:
+        path = self.path
+        self.distance += self.speed * dt
+        if self.distance >= path.length:
+            self.distance = path.length
+            self.pos.x, self.pos.y = path.end
             self.alive = False
             self.reached_base = True
             return
 
-        tx, ty = self.waypoints[self.wp_idx + 1]
-        vx = tx - self.pos.x
-        vy = ty - self.pos.y
-        nx, ny = normalize(vx, vy)
-
-        step = self.speed * dt
-        self.pos.x += nx * step
-        self.pos.y += ny * step
-
-        self.progress = self.wp_idx + (1.0 - min(1.0, dist((self.pos.x, self.pos.y), (tx, ty)) / 220.0))
-
-        if dist((self.pos.x, self.pos.y), (tx, ty)) < 8:
-            self.wp_idx += 1
+        self.pos.x, self.pos.y, self.wp_idx = path.position(self.distance, self.wp_idx)
 
         self._bob_t += dt * 4.5
 
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0, bars=None, skip_full_bar=False):
         if not self.alive:
             return
 
-        x, y = int(self.pos.x), int(self.pos.y)
+        x, y = self.render_pos(alpha)
+        x, y = int(x), int(y)
         bob = int(2 * sin(self._bob_t))
 
         if self.sprite is not None:
             rect = self.sprite.get_rect(center=(x, y + bob))
-            screen.blit(self.sprite, rect)
+            rect = screen.blit(self.sprite, rect)
         else:
             body = (220, 70, 70) if self.slow_factor >= 1.0 else (120, 170, 255)
-            pygame.draw.circle(screen, body, (x, y + bob), self.radius)
+            rect = pygame.draw.circle(screen, body, (x, y + bob), self.radius)
 
 
-        w, h = 34, 6
-        bx = x - w // 2
-        by = (y + bob) - self.radius - 18
-        pygame.draw.rect(screen, (30, 30, 40), (bx, by, w, h), border_radius=3)
-        fill = int(w * max(0.0, self.hp / self.hp_max))
-        pygame.draw.rect(screen, (80, 220, 120), (bx, by, fill, h), border_radius=3)
-        pygame.draw.rect(screen, (150, 150, 200), (bx, by, w, h), 1, border_radius=3)
+        bar = self.draw_health_bar(screen, x, y + bob, bars, skip_full_bar)
+
+        # zamalowany obszar (dla renderera dirty rect)
+        return rect if bar is None else rect.union(bar)
 
 class BossEnemy(Enemy):
+    __slots__ = ("tower_kill_cd", "tower_kill_timer", "is_boss", "used_tower_kill")
+
+    PULSE = 0.05
+    BAR_SIZE = (60, 7)
+    BAR_COLORS = ((30, 30, 40), (255, 170, 70), (200, 200, 230))
+    BAR_OFFSET = 20
 
-    def __init__(self, waypoints, hp, speed, reward, damage_to_base=5, tower_kill_cd=5.0):
-        super().__init__(waypoints, hp, speed, reward, damage_to_base=damage_to_base)
+    def reset(self, waypoints, hp, speed, reward, damage_to_base=5, tower_kill_cd=5.0, rng=None):
+        super().reset(waypoints, hp, speed, reward, damage_to_base=damage_to_base, rng=rng)
         self.radius = 22
         self.tower_kill_cd = float(tower_kill_cd)
         self.tower_kill_timer = self.tower_kill_cd
@@ -128,7 +203,7 @@ class BossEnemy(Enemy):
             return
         self.tower_kill_timer -= dt
 
-    def try_destroy_random_tower(self, towers):
+    def try_destroy_random_tower(self, towers, rng=None):
         # max 1 wieża na całą falę
         if not self.alive:
             return None
@@ -143,46 +218,51 @@ class BossEnemy(Enemy):
             self.tower_kill_timer = self.tower_kill_cd
             return None
 
-        victim = random.choice(towers)
+        victim = (rng or random).choice(towers)
         self.used_tower_kill = True  # <-- po tym już nie niszczy więcej
         return victim
 
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0, bars=None, skip_full_bar=False):
         if not self.alive:
             return
 
-        x, y = int(self.pos.x), int(self.pos.y)
+        x, y = self.render_pos(alpha)
+        x, y = int(x), int(y)
         bob = int(3 * sin(self._bob_t))
 
         if self.sprite is not None:
             t = pygame.time.get_ticks() / 1000.0
-            s = 1.0 + 0.05 * sin(t * 3.0)
-            w = int(self.sprite.get_width() * s)
-            h = int(self.sprite.get_height() * s)
-            spr = pygame.transform.smoothscale(self.sprite, (w, h))
+            spr = pulse_frame(self.sprite, self.PULSE, sin(t * 3.0))
             rect = spr.get_rect(center=(x, y + bob))
-            screen.blit(spr, rect)
+            rect = screen.blit(spr, rect)
         else:
-            pygame.draw.circle(screen, (255, 120, 50), (x, y + bob), self.radius)
+            rect = pygame.draw.circle(screen, (255, 120, 50), (x, y + bob), self.radius)
             pygame.draw.circle(screen, (255, 220, 150), (x, y + bob), self.radius, 2)
 
 
-        w, h = 60, 7
-        bx = x - w // 2
-        by = (y + bob) - self.radius - 20
-        pygame.draw.rect(screen, (30, 30, 40), (bx, by, w, h), border_radius=3)
-        fill = int(w * max(0.0, self.hp / self.hp_max))
-        pygame.draw.rect(screen, (255, 170, 70), (bx, by, fill, h), border_radius=3)
-        pygame.draw.rect(screen, (200, 200, 230), (bx, by, w, h), 1, border_radius=3)
+        bar = self.draw_health_bar(screen, x, y + bob, bars, skip_full_bar)
 
-# -------------------- PROJECTILES --------------------
+        return rect if bar is None else rect.union(bar)
 
-class Bullet:
+# -------------------- PROJECTILES --------------------
 
-    def __init__(self, pos, target, speed, dmg, kind="cannon", radius=4, slow=None):
-        self.pos = pygame.Vector2(pos[0], pos[1])
-        self.prev = self.pos.copy()
+class Bullet(Pooled):
+    __slots__ = (
+        "pos", "prev", "target", "target_handle", "speed", "dmg", "radius", "kind", "alive", "slow", "_t",
+        "handle",
+    )
+
+    def __init__(self, *args, **kwargs):
+        self.handle = 0
+        self.pos = pygame.Vector2()
+        self.prev = pygame.Vector2()
+        self.reset(*args, **kwargs)
+
+    def reset(self, pos, target, speed, dmg, kind="cannon", radius=4, slow=None):
+        self.pos.update(pos[0], pos[1])
+        self.prev.update(self.pos)
         self.target = target
+        self.target_handle = target.handle if target is not None else 0
         self.speed = float(speed)
         self.dmg = float(dmg)
         self.radius = radius
@@ -195,26 +275,39 @@ class Bullet:
         if not self.alive:
             return
         self._t += dt
-        if self.target is None or not self.target.alive:
+        if not self.has_target():
             self.alive = False
             return
 
-        self.prev = self.pos.copy()
-
-        tx, ty = self.target.pos.x, self.target.pos.y
-        vx = tx - self.pos.x
-        vy = ty - self.pos.y
-        nx, ny = normalize(vx, vy)
-        self.pos.x += nx * self.speed * dt
-        self.pos.y += ny * self.speed * dt
-
-        if dist((self.pos.x, self.pos.y), (tx, ty)) <= (self.radius + self.target.radius):
+        # bez tymczasowych obiektów: prev kopiowany w miejscu, odległości w kwadratach
+        pos = self.pos
+        self.prev.update(pos)
+
+        tpos = self.target.pos
+        tx, ty = tpos.x, tpos.y
+        vx = tx - pos.x
+        vy = ty - pos.y
+        d = sqrt(vx*vx + vy*vy)
+        if d > 0:
+            k = self.speed * dt / d
+            pos.x += vx * k
+            pos.y += vy * k
+
+        dx = tx - pos.x
+        dy = ty - pos.y
+        hit_r = self.radius + self.target.radius
+        if dx*dx + dy*dy <= hit_r * hit_r:
             self.target.take_damage(self.dmg)
             if self.slow is not None and self.target.alive:
                 factor, duration = self.slow
                 self.target.apply_slow(factor, duration)
             self.alive = False
 
+    def has_target(self):
+        # cel mógł zginąć i wrócić do puli jako inny przeciwnik - wtedy ma inny uchwyt
+        t = self.target
+        return t is not None and t.handle == self.target_handle and t.alive
+
     def _draw_star(self, screen, center, r_outer, r_inner):
         cx, cy = center
         pts = []
@@ -222,74 +315,96 @@ class Bullet:
             ang = i * 3.14159 / 5.0
             r = r_outer if i % 2 == 0 else r_inner
             pts.append((cx + r * sin(ang*2.0 + 0.0), cy - r * sin(ang*2.0 - 1.0)))
-        pygame.draw.polygon(screen, (170, 210, 255), pts)
+        rect = pygame.draw.polygon(screen, (170, 210, 255), pts)
         pygame.draw.polygon(screen, (230, 240, 255), pts, 1)
+        return rect
 
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
         if not self.alive:
             return
-        x, y = int(self.pos.x), int(self.pos.y)
+        x = int(self.prev.x + (self.pos.x - self.prev.x) * alpha)
+        y = int(self.prev.y + (self.pos.y - self.prev.y) * alpha)
 
         if self.kind == "cannon":
-            pygame.draw.circle(screen, (255, 210, 120), (x, y), self.radius)
+            return pygame.draw.circle(screen, (255, 210, 120), (x, y), self.radius)
         elif self.kind == "slow":
             pulse = 1.0 + 0.2 * sin(self._t * 10.0)
             ro = int(6 * pulse)
             ri = int(3 * pulse)
-            self._draw_star(screen, (x, y), ro, ri)
+            return self._draw_star(screen, (x, y), ro, ri)
         else:
-            pygame.draw.circle(screen, (255, 255, 255), (x, y), self.radius)
+            return pygame.draw.circle(screen, (255, 255, 255), (x, y), self.radius)
+
+class Beam(Pooled):
+    __slots__ = ("start", "target", "target_handle", "dmg", "expires_at", "alive", "handle")
 
-class Beam:
+    def __init__(self, *args, **kwargs):
+        self.handle = 0
+        self.start = pygame.Vector2()
+        self.reset(*args, **kwargs)
 
-    def __init__(self, start_pos, target, dmg, duration=0.06):
-        self.start = pygame.Vector2(start_pos[0], start_pos[1])
+    def reset(self, start_pos, target, dmg, duration=0.06, now=0.0):
+        self.start.update(start_pos[0], start_pos[1])
         self.target = target
+        self.target_handle = target.handle if target is not None else 0
         self.dmg = float(dmg)
-        self.timer = float(duration)
+        # czas symulacji końca promienia, gaszony przez TimerQueue
+        self.expires_at = now + duration
         self.alive = True
 
         if self.target is not None and self.target.alive:
             self.target.take_damage(self.dmg)
 
-    def update(self, dt: float):
-        if not self.alive:
-            return
-        self.timer -= dt
-        if self.timer <= 0:
+    def on_timer(self, sim):
+        # wpis z kopca może być nieaktualny, gdy obiekt z puli dostał już nowy promień
+        if self.alive and self.expires_at <= sim.time + EPS:
             self.alive = False
 
-    def draw(self, screen):
+    def has_target(self):
+        t = self.target
+        return t is not None and t.handle == self.target_handle and t.alive
+
+    def draw(self, screen, alpha=1.0):
         if not self.alive:
             return
-        if self.target is None or not self.target.alive:
+        if not self.has_target():
             return
         sx, sy = int(self.start.x), int(self.start.y)
-        tx, ty = int(self.target.pos.x), int(self.target.pos.y)
+        tx, ty = self.target.render_pos(alpha)
+        tx, ty = int(tx), int(ty)
 
-        pygame.draw.line(screen, (80, 180, 255), (sx, sy), (tx, ty), 4)
+        rect = pygame.draw.line(screen, (80, 180, 255), (sx, sy), (tx, ty), 4)
         pygame.draw.line(screen, (220, 245, 255), (sx, sy), (tx, ty), 2)
+        return rect
 
 # -------------------- TOWERS --------------------
 
 class Tower:
+    __slots__ = (
+        "pos", "level", "range", "cooldown", "damage", "bullet_speed", "ready_at",
+        "sprite", "radius", "_anim_t", "handle",
+    )
+
     NAME = "Tower"
     COST = 50
+    PULSE = 0.04
     UPGRADE_COSTS = (40, 60)
 
-    def __init__(self, pos, sprite: pygame.Surface = None):
+    def __init__(self, pos, sprite: pygame.Surface = None, rng=None):
+        self.handle = 0
         self.pos = pygame.Vector2(pos[0], pos[1])
         self.level = 1
         self.range = 130
         self.cooldown = 0.5
         self.damage = 10
         self.bullet_speed = 380
-        self.cd_timer = 0.0
+        # czas symulacji, od którego wieża może znowu strzelić
+        self.ready_at = 0.0
 
         self.sprite = sprite
         self.radius = 18 if sprite is None else max(18, sprite.get_width() // 2)
 
-        self._anim_t = random.random() * 6.28
+        self._anim_t = (rng or random).random() * 6.28
 
     def can_upgrade(self):
         return self.level < 3
@@ -309,80 +424,91 @@ class Tower:
         self.range += 15
         self.cooldown *= 0.92
 
-    def pick_target(self, enemies):
+    def pick_target(self, enemies, grid=None):
+        x, y = self.pos.x, self.pos.y
+        if grid is not None:
+            return grid.best_in_range(x, y, self.range)
+
+        r2 = self.range * self.range
         best = None
         best_prog = -1e9
         for e in enemies:
             if not e.alive:
                 continue
-            if dist((self.pos.x, self.pos.y), (e.pos.x, e.pos.y)) <= self.range:
+            dx = e.pos.x - x
+            dy = e.pos.y - y
+            if dx * dx + dy * dy <= r2:
                 if e.progress > best_prog:
                     best_prog = e.progress
                     best = e
         return best
 
-    def update(self, dt, enemies, bullets, beams):
-        self._anim_t += dt * 4.0
-
-        if self.cd_timer > 0:
-            self.cd_timer -= dt
-            if self.cd_timer < 0:
-                self.cd_timer = 0
-
-        self.try_shoot(enemies, bullets, beams)
+    def on_timer(self, sim):
+        # koniec przeładowania: wieża wraca do gotowych (chyba że ją zniszczono)
+        if self.handle and self.ready_at <= sim.time + EPS:
+            sim.ready_towers.add(self)
 
-    def try_shoot(self, enemies, bullets, beams):
-        if self.cd_timer > 0:
-            return
-        target = self.pick_target(enemies)
+    def try_shoot(self, enemies, bullets, beams, grid=None, timers=None):
+        # True, gdy wieża strzeliła; przeładowanie (ready_at) planuje Simulation
+        target = self.pick_target(enemies, grid)
         if target is None:
-            return
-        bullets.append(Bullet(self.pos, target, self.bullet_speed, self.damage, kind="cannon"))
-        self.cd_timer = self.cooldown
+            return False
+        bullets.append(Bullet.acquire(self.pos, target, self.bullet_speed, self.damage, kind="cannon"))
+        return True
 
-    def draw(self, screen, selected=False):
+    def draw(self, screen, selected=False, time=0.0):
         x, y = int(self.pos.x), int(self.pos.y)
 
-        pulse = 1.0 + 0.04 * sin(self._anim_t)
         if self.sprite is not None:
-            w = int(self.sprite.get_width() * pulse)
-            h = int(self.sprite.get_height() * pulse)
-            spr = pygame.transform.smoothscale(self.sprite, (w, h))
+            # pulsowanie liczone z czasu gry przy rysowaniu, symulacja go nie odlicza
+            spr = pulse_frame(self.sprite, self.PULSE, sin(self._anim_t + time * 4.0))
             rect = spr.get_rect(center=(x, y))
-            screen.blit(spr, rect)
+            rect = screen.blit(spr, rect)
         else:
-            pygame.draw.circle(screen, (60, 60, 90), (x, y), self.radius)
+            rect = pygame.draw.circle(screen, (60, 60, 90), (x, y), self.radius)
 
         if selected:
-            pygame.draw.circle(screen, (255, 255, 255), (x, y), self.radius + 2, 2)
+            rect = rect.union(pygame.draw.circle(screen, (255, 255, 255), (x, y), self.radius + 2, 2))
+        return rect
 
 class LaserTower(Tower):
     NAME = "Laser"
     COST = 60
     UPGRADE_COSTS = (45, 70)
 
-    def __init__(self, pos, sprite=None):
-        super().__init__(pos, sprite=sprite)
+    __slots__ = ()
+
+    def __init__(self, pos, sprite=None, rng=None):
+        super().__init__(pos, sprite=sprite, rng=rng)
         self.range = 155
         self.cooldown = 0.20
         self.damage = 8
 
-    def try_shoot(self, enemies, bullets, beams):
-        if self.cd_timer > 0:
-            return
-        target = self.pick_target(enemies)
+    def try_shoot(self, enemies, bullets, beams, grid=None, timers=None):
+        target = self.pick_target(enemies, grid)
         if target is None:
-            return
-        beams.append(Beam(self.pos, target, self.damage, duration=0.06))
-        self.cd_timer = self.cooldown
+            return False
+        if timers is not None:
+            # dawny licznik promienia odliczał już w ticku strzału, stąd - dt
+            now = timers.now - timers.dt
+            duration = countdown(0.06, timers.dt)
+        else:
+            now, duration = 0.0, 0.06
+        beam = Beam.acquire(self.pos, target, self.damage, duration=duration, now=now)
+        beams.append(beam)
+        if timers is not None:
+            timers.schedule(beam.expires_at, beam)
+        return True
 
 class CannonTower(Tower):
     NAME = "Cannon"
     COST = 85
     UPGRADE_COSTS = (60, 90)
 
-    def __init__(self, pos, sprite=None):
-        super().__init__(pos, sprite=sprite)
+    __slots__ = ()
+
+    def __init__(self, pos, sprite=None, rng=None):
+        super().__init__(pos, sprite=sprite, rng=rng)
         self.range = 160
         self.cooldown = 0.75
         self.damage = 22
@@ -393,8 +519,10 @@ class SlowTower(Tower):
     COST = 70
     UPGRADE_COSTS = (55, 80)
 
-    def __init__(self, pos, sprite=None):
-        super().__init__(pos, sprite=sprite)
+    __slots__ = ("slow_factor", "slow_duration")
+
+    def __init__(self, pos, sprite=None, rng=None):
+        super().__init__(pos, sprite=sprite, rng=rng)
         self.range = 150
         self.cooldown = 0.55
         self.damage = 5
@@ -402,16 +530,14 @@ class SlowTower(Tower):
         self.slow_factor = 0.65
         self.slow_duration = 1.4
 
-    def try_shoot(self, enemies, bullets, beams):
-        if self.cd_timer > 0:
-            return
-        target = self.pick_target(enemies)
+    def try_shoot(self, enemies, bullets, beams, grid=None, timers=None):
+        target = self.pick_target(enemies, grid)
         if target is None:
-            return
+            return False
         bullets.append(
-            Bullet(self.pos, target, self.bullet_speed, self.damage, kind="slow", slow=(self.slow_factor, self.slow_duration))
+            Bullet.acquire(self.pos, target, self.bullet_speed, self.damage, kind="slow", slow=(self.slow_factor, self.slow_duration))
         )
-        self.cd_timer = self.cooldown
+        return True
 
     def upgrade(self):
         if self.level >= 3:
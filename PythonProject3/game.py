@@ -1,23 +1,87 @@
+import os
+import time
+
 import pygame
 
-from map_data import SCREEN_W, SCREEN_H, WAYPOINTS, draw_background, draw_path, is_on_path
-from entities import LaserTower, CannonTower, SlowTower
-from wave import WaveManager
-from ui import Button, draw_hud, draw_game_over
-from highscore import load_highscore, save_highscore
-from assets import load_image
+from map_data import SCREEN_W, SCREEN_H, WAYPOINTS, StaticLayer
+from simulation import Simulation
+from ui import Button, draw_hud, draw_game_over, draw_placement_ghost, draw_speed, render_panel, TEXT_CACHE
+from highscore import Leaderboard
+from assets import ASSETS, load_font, pulse_frames
+from renderer import DirtyRenderer
+from profiler import FrameProfiler
+from replay import Replay
+from savegame import SAVE_FILE, SaveError, save_game, load_game
+from entities import BossEnemy, Tower
+
+# sprite'y gry: nazwa -> (ścieżka, rozmiar)
+SPRITES = {
+    "alien": ("enemies/alien.png", (40, 40)),
+    "alien2": ("enemies/alien2.png", (40, 40)),
+    "boss": ("enemies/boss.png", (70, 70)),
+    "base": ("base.png", (120, 160)),
+    "Laser": ("towers/laser.png", (44, 44)),
+    "Cannon": ("towers/cannon.png", (44, 44)),
+    "Slow": ("towers/slow.png", (44, 44)),
+}
+
+
+def load_sprites(headless=False):
+    # (przeciwnicy, boss, wieże) z ASSETS; headless - bez okna gry (np. odtwarzanie powtórki)
+    if headless and pygame.display.get_surface() is None:
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+    enemy_sprites = [ASSETS.get(*SPRITES["alien"]), ASSETS.get(*SPRITES["alien2"])]
+    boss_sprite = ASSETS.get(*SPRITES["boss"])
+    tower_sprites = {mode: ASSETS.get(*SPRITES[mode]) for mode in ("Laser", "Cannon", "Slow")}
+    return enemy_sprites, boss_sprite, tower_sprites
+
+
+# prędkości gry przełączane klawiszem F
+TIME_SCALES = (1, 2, 4, 8)
 
 
 class Game:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, sim_hz=60, fps=60, max_catchup_steps=5, dirty_rects=False,
+                 hide_full_health_bars=False, preload_assets=False, startup_report=False, started_at=None,
+                 profile=False, profile_csv=None, seed=None, record_replay=None, time_scale=1):
+        # czasy kolejnych etapów startu (do --startup-report)
+        self.startup_report = startup_report
+        self.startup_times = []
+        self._phase_t = time.perf_counter()
+        if started_at is not None:
+            self.startup_times.append(("importy", self._phase_t - started_at))
+
+        # częstotliwość symulacji i wyświetlania są od siebie niezależne
+        self.sim_dt = 1.0 / sim_hz
+        self.fps = fps
+        self.max_catchup_steps = max_catchup_steps
+        self.accumulator = 0.0
+        self.alpha = 1.0
+
+        # przyspieszenie (F): więcej stałych kroków na klatkę, rysowanie dalej raz na klatkę.
+        # Gdy kroki nie mieszczą się w czasie klatki, reszta jest porzucana (backpressure)
+        # i gra faktycznie idzie wolniej - effective_scale to osiągnięta prędkość.
+        self.time_scale = time_scale
+        self.sim_budget = 0.8 / fps
+        self.backpressure = 0
+        self.effective_scale = float(time_scale)
+
+        # tylko potrzebne podsystemy (bez dźwięku i joysticków);
+        # zegar SDL startuje przy pierwszym clock.tick
+        pygame.display.init()
+        pygame.font.init()
+        self.startup_phase("pygame (display, font)")
+
         pygame.display.set_caption("Tower Defense: Obrona Stacji (Pixel Art)")
         self.screen = pygame.display.set_mode((SCREEN_W, SCREEN_H))
         self.clock = pygame.time.Clock()
+        self.startup_phase("okno")
 
-        self.font = pygame.font.SysFont("consolas", 20)
-        self.small_font = pygame.font.SysFont("consolas", 16)
-        self.big_font = pygame.font.SysFont("consolas", 56, bold=True)
+        self.font = load_font("consolas", 20)
+        self.small_font = load_font("consolas", 16)
+        self.big_font = load_font("consolas", 56, bold=True)
+        self.startup_phase("fonty")
 
         self.running = True
 
@@ -25,62 +89,181 @@ class Game:
         self.btn_start = Button((SCREEN_W // 2 - 120, 280, 240, 54), "START")
         self.btn_quit = Button((SCREEN_W // 2 - 120, 350, 240, 54), "WYJŚCIE")
 
-        self.highscore = load_highscore()
+        # tabela wyników: odczyt raz tutaj, potem tylko kopia w pamięci
+        self.leaderboard = Leaderboard()
+        self.highscore = self.leaderboard.best
+        self.startup_phase("tabela wyników")
+
+        # tło + ścieżka + baza, renderowane raz
+        self.static_layer = StaticLayer()
+        # opcjonalnie: odświeżanie tylko zmienionych prostokątów
+        self.renderer = DirtyRenderer() if dirty_rects else None
+        # paski życia pełnych przeciwników można pominąć (mniej blitów przy dużych falach)
+        self.hide_full_health_bars = hide_full_health_bars
+
+        # profiler faz klatki: F3 włącza nakładkę, opcjonalnie zapis każdej klatki do CSV
+        self.profiler = FrameProfiler()
+        if profile_csv:
+            self.profiler.open_csv(profile_csv)
+        self._profiler_toggle = profile
+        self._profiler_panel = None
+        self._steps = 0
+
+        # ziarno gry (None = losowe przy każdym resecie) i plik, do którego nagrywamy powtórkę
+        self.seed = seed
+        self.record_replay = record_replay
+        self.replay = None
+
+        # sprite'y i symulacja powstają dopiero po START (reset_game),
+        # menu potrzebuje tylko fontów
+        self.sim = None
+        self.selected_tower = None
+        self.build_mode = None
+        if preload_assets:
+            ASSETS.preload(SPRITES.values())
+        self.startup_phase("menu")
 
-        self.reset_game()
+    def startup_phase(self, name):
+        now = time.perf_counter()
+        self.startup_times.append((name, now - self._phase_t))
+        self._phase_t = now
 
-    def reset_game(self):
-        # obiekty
-        self.enemies = []
-        self.towers = []
-        self.bullets = []
-        self.beams = []
+    def print_startup_report(self):
+        for name, sec in self.startup_times:
+            print(f"start: {name:<24} {sec * 1000:8.1f} ms")
+        total = sum(sec for _, sec in self.startup_times)
+        print(f"start: {'razem do 1. klatki':<24} {total * 1000:8.1f} ms")
 
-        # stan rozgrywki
-        self.base_hp = 25
-        self.credits = 120
-        self.score = 0
+    def load_game_sprites(self):
+        # wspólne powierzchnie z ASSETS, pliki są czytane z dysku tylko raz
+        self.enemy_sprites, self.boss_sprite, self.tower_sprites = load_sprites()
 
-        #  (blokada budowy
-        self.base_rect = pygame.Rect(SCREEN_W - 110, SCREEN_H // 2 - 70, 90, 140)
 
-        #
-        self.enemy_sprites = [
-            load_image("enemies/alien.png", scale=(40, 40)),
-            load_image("enemies/alien2.png", scale=(40, 40)),
-        ]
+        self.base_sprite = ASSETS.get(*SPRITES["base"])
 
+        # klatki pulsowania liczone od razu przy ładowaniu, nie w pierwszej klatce gry
+        pulse_frames(self.boss_sprite, BossEnemy.PULSE)
+        for spr in self.tower_sprites.values():
+            pulse_frames(spr, Tower.PULSE)
 
-        self.boss_sprite = load_image("enemies/boss.png", scale=(70, 70))
+    def reset_game(self):
+        self.load_game_sprites()
 
+        # cała logika gry siedzi w symulacji, Game tylko ją rysuje
+        self.sim = Simulation(
+            WAYPOINTS,
+            enemy_sprites=self.enemy_sprites,
+            boss_sprite=self.boss_sprite,
+            tower_sprites=self.tower_sprites,
+            dt=self.sim_dt,
+            seed=self.seed
+        )
+        if self.record_replay:
+            self.replay = Replay.record_into(self.sim)
+        self.sim.profiler = self.profiler if self.profiler.enabled else None
+        self.accumulator = 0.0
+        self.alpha = 1.0
 
-        self.base_sprite = load_image("base.png", scale=(120, 160))
 
+        self.selected_tower = None
+        self.build_mode = None
 
-        self.tower_sprites = {
-            "Laser": load_image("towers/laser.png", scale=(44, 44)),
-            "Cannon": load_image("towers/cannon.png", scale=(44, 44)),
-            "Slow": load_image("towers/slow.png", scale=(44, 44)),
+    def set_profiling(self, on):
+        self.profiler.enabled = on
+        self._profiler_panel = None
+        if self.sim is not None:
+            self.sim.profiler = self.profiler if on else None
+        if self.renderer is not None:
+            self.renderer.invalidate()
+
+    def set_time_scale(self, scale):
+        self.time_scale = scale
+        self.effective_scale = float(scale)
+        self.backpressure = 0
+
+    def profile_counts(self):
+        sim = self.sim
+        return {
+            "enemies": len(sim.enemies) if sim else 0,
+            "towers": len(sim.towers) if sim else 0,
+            "bullets": len(sim.bullets) if sim else 0,
+            "beams": len(sim.beams) if sim else 0,
+            "steps": self._steps,
+            "fps": self.clock.get_fps(),
         }
 
+    # -------------------- ZAPIS STANU --------------------
 
-        self.wave_manager = WaveManager(
-            WAYPOINTS,
-            enemy_sprites=self.enemy_sprites,
-            boss_sprite=self.boss_sprite
-        )
+    def quicksave(self):
+        if self.sim is None or self.sim.game_over:
+            return
+        try:
+            save_game(self.sim, SAVE_FILE)
+        except OSError:
+            pass
 
+    def quickload(self):
+        if not os.path.exists(SAVE_FILE):
+            return
+        if self.sim is None:
+            self.load_game_sprites()
+        try:
+            sim = load_game(SAVE_FILE, self.enemy_sprites, self.boss_sprite, self.tower_sprites)
+        except (OSError, SaveError):
+            return
 
+        # nagrywana powtórka nie obejmuje wczytanego stanu, więc kończymy ją tutaj
+        self.save_replay()
+        self.replay = None
+        self.sim = sim
+        sim.profiler = self.profiler if self.profiler.enabled else None
+        self.accumulator = 0.0
+        self.alpha = 1.0
         self.selected_tower = None
         self.build_mode = None
+        self.state = "PLAY"
+        if self.renderer is not None:
+            self.renderer.invalidate()
+
+    def save_replay(self):
+        if self.replay is not None and self.sim is not None:
+            self.replay.save(self.record_replay, self.sim)
 
     def run(self):
+        try:
+            self._run()
+        finally:
+            # powtórka zapisywana też przy wyjątku - do odtworzenia zgłoszonego błędu
+            self.save_replay()
+            self.profiler.close_csv()
+            self.leaderboard.close()
+            pygame.quit()
+
+    def _run(self):
+        first_frame = True
         while self.running:
-            dt = self.clock.tick(60) / 1000.0
+            frame_dt = self.clock.tick(self.fps) / 1000.0
+
+            # przełączenie profilera tylko na granicy klatek
+            if self._profiler_toggle:
+                self._profiler_toggle = False
+                self.set_profiling(not self.profiler.enabled)
+            prof = self.profiler if self.profiler.enabled else None
+            if prof is not None:
+                prof.begin_frame()
+
             self.handle_events()
-            self.update(dt)
+            if prof is not None:
+                prof.mark("zdarzenia")
+            self.update(frame_dt)
             self.draw()
-        pygame.quit()
+            if prof is not None:
+                prof.end_frame(self.profile_counts())
+            if first_frame:
+                first_frame = False
+                self.startup_phase("pierwsza klatka")
+                if self.startup_report:
+                    self.print_startup_report()
 
     def handle_events(self):
         for event in pygame.event.get():
@@ -88,6 +271,16 @@ class Game:
                 self.running = False
                 return
 
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self._profiler_toggle = True
+
+            # F5 szybki zapis, F9 wczytanie (także z menu)
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F5 and self.state == "PLAY":
+                self.quicksave()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F9:
+                self.quickload()
+                continue
+
             if self.state == "MENU":
                 if self.btn_start.handle_event(event):
                     self.reset_game()
@@ -117,15 +310,14 @@ class Game:
                 self.build_mode = "Slow"
 
             elif event.key == pygame.K_SPACE:
-                if self.wave_manager.is_wave_finished(self.enemies):
-                    self.wave_manager.start_next_wave()
+                self.sim.start_next_wave()
 
             elif event.key == pygame.K_u:
-                if self.selected_tower is not None and self.selected_tower.can_upgrade():
-                    cost = self.selected_tower.upgrade_cost()
-                    if self.credits >= cost:
-                        self.credits -= cost
-                        self.selected_tower.upgrade()
+                self.sim.try_upgrade(self.selected_tower)
+
+            elif event.key == pygame.K_f:
+                self.set_time_scale(TIME_SCALES[(TIME_SCALES.index(self.time_scale) + 1) % len(TIME_SCALES)]
+                                    if self.time_scale in TIME_SCALES else 1)
 
 
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -136,171 +328,173 @@ class Game:
                 mx, my = event.pos
 
 
-                clicked = None
-                for t in self.towers:
-                    if (t.pos.x - mx) ** 2 + (t.pos.y - my) ** 2 <= (t.radius + 6) ** 2:
-                        clicked = t
-                        break
+                clicked = self.sim.tower_at((mx, my))
                 if clicked is not None:
                     self.selected_tower = clicked
                     return
 
 
                 if self.build_mode is not None:
-
-                    if self.base_rect.collidepoint((mx, my)):
-                        return
-                    if is_on_path((mx, my)):
+                    if not self.sim.can_build((mx, my)):
                         return
-                    if self.is_too_close_to_other_tower((mx, my)):
-                        return
-
-                    self.try_build_tower((mx, my), self.build_mode)
-
-    def is_too_close_to_other_tower(self, pos):
-        px, py = pos
-        for t in self.towers:
-            if (t.pos.x - px) ** 2 + (t.pos.y - py) ** 2 < (36) ** 2:
-                return True
-        return False
-
-    def try_build_tower(self, pos, mode):
-        if mode == "Laser":
-            if self.credits >= LaserTower.COST:
-                self.credits -= LaserTower.COST
-                self.towers.append(LaserTower(pos, sprite=self.tower_sprites["Laser"]))
-
-        elif mode == "Cannon":
-            if self.credits >= CannonTower.COST:
-                self.credits -= CannonTower.COST
-                self.towers.append(CannonTower(pos, sprite=self.tower_sprites["Cannon"]))
 
-        elif mode == "Slow":
-            if self.credits >= SlowTower.COST:
-                self.credits -= SlowTower.COST
-                self.towers.append(SlowTower(pos, sprite=self.tower_sprites["Slow"]))
+                    self.sim.try_build_tower((mx, my), self.build_mode)
 
-    def update(self, dt):
+    def update(self, frame_dt):
         if self.state in ("MENU", "GAME_OVER"):
+            self.accumulator = 0.0
+            self.alpha = 1.0
             return
 
-
-        self.wave_manager.update(dt, self.enemies)
-
-
-        for e in self.enemies:
-            e.update(dt)
-
-
-        to_remove = []
-        for e in self.enemies:
-            if hasattr(e, "try_destroy_random_tower"):
-                victim = e.try_destroy_random_tower(self.towers)
-                if victim is not None:
-                    to_remove.append(victim)
-
-        if to_remove:
-            self.towers = [t for t in self.towers if t not in to_remove]
-            if self.selected_tower in to_remove:
+        # akumulator: symulacja idzie zawsze stałym krokiem sim.dt, a wolna
+        # klatka kosztuje tylko czas rysowania, nie poprawność symulacji.
+        # Przyspieszenie dokłada czasu do akumulatora, krok zostaje ten sam,
+        # więc gra na x8 liczy dokładnie to samo co na x1.
+        step = self.sim.dt
+        scale = self.time_scale
+        self.accumulator += frame_dt * scale
+        max_steps = self.max_catchup_steps * scale
+        deadline = time.perf_counter() + self.sim_budget if scale > 1 else None
+        steps = self._steps = 0
+        while self.accumulator >= step and steps < max_steps:
+            if deadline is not None and steps and time.perf_counter() > deadline:
+                break
+            self.sim.step(step)
+            self.accumulator -= step
+            steps += 1
+            self._steps = steps
+
+            if self.selected_tower in self.sim.destroyed_towers:
                 self.selected_tower = None
 
+            if self.sim.game_over:
+                # zapis do bazy idzie w tle, ten tick nie czeka na dysk
+                self.leaderboard.add_run(self.sim.score, self.sim.wave_manager.wave, self.sim.time)
+                self.highscore = self.leaderboard.best
+                self.save_replay()
+                self.state = "GAME_OVER"
+                self.accumulator = 0.0
+                self.alpha = 1.0
+                return
 
-        for e in self.enemies:
-            if (not e.alive) and e.reached_base:
-                self.base_hp -= getattr(e, "damage_to_base", 1)
-                e.reached_base = False
-
-
-        for t in self.towers:
-            t.update(dt, self.enemies, self.bullets, self.beams)
-
-
-        for b in self.bullets:
-            b.update(dt)
-
-
-        for beam in self.beams:
-            beam.update(dt)
-
-
-        for e in self.enemies:
-            if (not e.alive) and (not e.reached_base) and (e.hp <= 0):
-                if getattr(e, "_counted", False) is False:
-                    e._counted = True
-                    self.credits += e.reward
-                    self.score += 1
-
-
-        self.enemies = [e for e in self.enemies if e.alive]
-        self.bullets = [b for b in self.bullets if b.alive]
-        self.beams = [x for x in self.beams if x.alive]
+        # za dużo zaległości (np. przycięcie okna albo za wolny procesor na tę prędkość)
+        # - porzucamy je zamiast nadrabiać
+        self.backpressure = int(self.accumulator // step)
+        if self.accumulator >= step:
+            self.accumulator %= step
 
+        if frame_dt > 0:
+            achieved = steps * step / frame_dt
+            self.effective_scale += (min(achieved, scale) - self.effective_scale) * 0.1
 
-        if self.base_hp <= 0:
-            self.base_hp = 0
-            self.highscore = max(self.highscore, self.score)
-            save_highscore(self.highscore)
-            self.state = "GAME_OVER"
+        self.alpha = self.accumulator / step
 
     def draw(self):
         if self.state == "MENU":
             self.draw_menu()
+            if self.renderer is not None:
+                self.renderer.invalidate()
             return
 
-        draw_background(self.screen)
-        draw_path(self.screen)
-
+        layer = self.static_layer.get(
+            self.screen,
+            self.sim.waypoints,
+            base_sprite=self.base_sprite,
+            base_center=self.sim.base_rect.center
+        )
+        if self.renderer is not None:
+            self.renderer.begin(self.screen, layer)
+        else:
+            self.screen.blit(layer, (0, 0))
+        prof = self.profiler if self.profiler.enabled else None
+        if prof is not None:
+            prof.mark("r:tło")
 
-        base_rect = self.base_sprite.get_rect(center=self.base_rect.center)
-        self.screen.blit(self.base_sprite, base_rect)
+        rects = []
 
 
         if self.selected_tower is not None:
-            pygame.draw.circle(
+            rects.append(pygame.draw.circle(
                 self.screen, (80, 80, 120),
                 (int(self.selected_tower.pos.x), int(self.selected_tower.pos.y)),
                 int(self.selected_tower.range), 1
-            )
+            ))
+
 
+        for t in self.sim.towers:
+            rects.append(t.draw(self.screen, selected=(t is self.selected_tower), time=self.sim.time))
 
-        for t in self.towers:
-            t.draw(self.screen, selected=(t is self.selected_tower))
+        # podgląd budowy - maska i siatka wież są na tyle tanie, że sprawdzamy co klatkę
+        if self.state == "PLAY" and self.build_mode is not None and pygame.mouse.get_focused():
+            mouse = pygame.mouse.get_pos()
+            if self.sim.tower_at(mouse) is None:
+                sprite = self.tower_sprites.get(self.build_mode)
+                radius = 18 if sprite is None else max(18, sprite.get_width() // 2)
+                rects.append(draw_placement_ghost(self.screen, mouse, radius, self.sim.can_build(mouse)))
+        if prof is not None:
+            prof.mark("r:wieże")
 
 
-        for beam in self.beams:
-            beam.draw(self.screen)
+        for beam in self.sim.beams:
+            rects.append(beam.draw(self.screen, self.alpha))
+        if prof is not None:
+            prof.mark("r:lasery")
 
 
-        for e in self.enemies:
-            e.draw(self.screen)
-        for b in self.bullets:
-            b.draw(self.screen)
+        # paski życia zbierane do jednej listy i rysowane jednym blits nad sprite'ami
+        bars = []
+        for e in self.sim.enemies:
+            rects.append(e.draw(self.screen, self.alpha, bars, self.hide_full_health_bars))
+        self.screen.blits(bars, False)
+        if prof is not None:
+            prof.mark("r:wrogowie")
+        for b in self.sim.bullets:
+            rects.append(b.draw(self.screen, self.alpha))
+        if prof is not None:
+            prof.mark("r:pociski")
 
 
-        draw_hud(
+        rects.extend(draw_hud(
             self.screen,
             self.font,
             self.small_font,
-            self.wave_manager.wave,
-            self.base_hp,
-            self.credits,
-            self.score,
+            self.sim.wave_manager.wave,
+            self.sim.base_hp,
+            self.sim.credits,
+            self.sim.score,
             self.highscore,
             self.selected_tower,
-            self.build_mode
-        )
+            self.build_mode,
+            self.sim.wave_manager.preview() if self.state == "PLAY" and self.sim.is_wave_finished() else None
+        ))
 
-        if self.state == "GAME_OVER":
-            draw_game_over(self.screen, self.font, self.big_font, self.score, self.highscore)
+        if self.time_scale != 1:
+            rects.append(draw_speed(self.screen, self.small_font, self.time_scale, self.effective_scale))
 
-        pygame.display.flip()
+        if self.state == "GAME_OVER":
+            rects.append(draw_game_over(self.screen, self.font, self.big_font, self.sim.score, self.highscore))
+
+        if prof is not None:
+            # panel odświeżany co 15 klatek, żeby sam nie zjadał czasu
+            if self._profiler_panel is None or prof.frame % 15 == 0:
+                self._profiler_panel = render_panel(self.small_font, prof.report(self.profile_counts()))
+            panel = self._profiler_panel
+            rects.append(self.screen.blit(panel, (SCREEN_W - panel.get_width() - 10, 10)))
+            prof.mark("r:hud")
+
+        if self.renderer is not None:
+            self.renderer.present(self.screen, rects)
+        else:
+            pygame.display.flip()
+        if prof is not None:
+            prof.mark("flip")
 
     def draw_menu(self):
         self.screen.fill((10, 10, 16))
 
-        title = self.big_font.render("TOWER DEFENSE", True, (255, 255, 255))
-        sub = self.font.render("Obrona stacji kosmicznej (Pixel Art)", True, (200, 200, 230))
-        hs = self.font.render(f"Highscore: {self.highscore}", True, (200, 200, 230))
+        title = TEXT_CACHE.render(self.big_font, "TOWER DEFENSE", (255, 255, 255))
+        sub = TEXT_CACHE.render(self.font, "Obrona stacji kosmicznej (Pixel Art)", (200, 200, 230))
+        hs = TEXT_CACHE.render(self.font, f"Highscore: {self.highscore}", (200, 200, 230))
 
         self.screen.blit(title, (SCREEN_W // 2 - title.get_width() // 2, 140))
         self.screen.blit(sub, (SCREEN_W // 2 - sub.get_width() // 2, 210))
@@ -309,10 +503,20 @@ class Game:
         self.btn_start.draw(self.screen, self.font)
         self.btn_quit.draw(self.screen, self.font)
 
-        tip = self.small_font.render(
+        tip = TEXT_CACHE.render(
+            self.small_font,
             "Sterowanie: 1/2/3 wybór wieży, klik - buduj, U - ulepsz, Spacja - fala",
-            True, (170, 170, 210)
+            (170, 170, 210)
         )
         self.screen.blit(tip, (SCREEN_W // 2 - tip.get_width() // 2, 430))
+        tip2 = TEXT_CACHE.render(self.small_font, "F5 - zapisz grę, F9 - wczytaj zapis, F - przyspieszenie", (170, 170, 210))
+        self.screen.blit(tip2, (SCREEN_W // 2 - tip2.get_width() // 2, 452))
+
+        for i, (score, wave, duration, _) in enumerate(self.leaderboard.top[:5]):
+            minutes, seconds = divmod(int(duration), 60)
+            line = TEXT_CACHE.render(
+                self.small_font, f"{i + 1}. {score:>6} pkt   fala {wave:>3}   {minutes}:{seconds:02d}", (150, 150, 190)
+            )
+            self.screen.blit(line, (SCREEN_W // 2 - line.get_width() // 2, 495 + i * 22))
 
         pygame.display.flip()
@@ -1,21 +1,115 @@
 import json
 import os
+import queue
+import sqlite3
+import threading
+import time
 
-FILE_NAME = "highscore.json"
-
-def load_highscore():
-    if not os.path.exists(FILE_NAME):
-        return 0
-    try:
-        with open(FILE_NAME, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return int(data.get("highscore", 0))
-    except Exception:
-        return 0
-
-def save_highscore(score: int):
-    try:
-        with open(FILE_NAME, "w", encoding="utf-8") as f:
-            json.dump({"highscore": int(score)}, f, ensure_ascii=False, indent=2)
-    except Exception:
-        pass
+# Tabela wyników w SQLite obok plików gry (nie w bieżącym katalogu).
+# Zapis idzie przez wątek w tle, więc koniec gry nie czeka na dysk, a każda
+# runda to jedna transakcja - przerwany zapis nie psuje wcześniejszych wyników.
+# Menu i HUD czytają tylko kopię w pamięci.
+DB_FILE = os.path.join(os.path.dirname(__file__), "leaderboard.db")
+LEGACY_FILE = "highscore.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    wave INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC, played_at);
+CREATE INDEX IF NOT EXISTS runs_by_date ON runs (played_at DESC);
+"""
+
+TOP_QUERY = "SELECT score, wave, duration, played_at FROM runs ORDER BY score DESC, played_at LIMIT ?"
+
+
+def _connect(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _import_legacy(conn):
+    # jednorazowo: stary highscore.json z katalogu gry lub bieżącego staje się pierwszą rundą
+    if conn.execute("SELECT 1 FROM runs LIMIT 1").fetchone() is not None:
+        return
+    for path in (os.path.join(os.path.dirname(__file__), LEGACY_FILE), LEGACY_FILE):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                score = int(json.load(f).get("highscore", 0))
+        except Exception:
+            continue
+        if score > 0:
+            with conn:
+                conn.execute(
+                    "INSERT INTO runs (score, wave, duration, played_at) VALUES (?, 0, 0, ?)",
+                    (score, os.path.getmtime(path)),
+                )
+        return
+
+
+class Leaderboard:
+    def __init__(self, path=DB_FILE, size=10):
+        self.path = path
+        self.size = size
+        # kopia w pamięci: (wynik, fala, czas gry, kiedy) od najlepszego
+        self.top = []
+        self.best = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self.load()
+
+    def load(self):
+        try:
+            conn = _connect(self.path)
+            try:
+                _import_legacy(conn)
+                self.top = [tuple(row) for row in conn.execute(TOP_QUERY, (self.size,))]
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            self.top = []
+        self.best = self.top[0][0] if self.top else 0
+
+    # -------------------- ZAPIS --------------------
+
+    def add_run(self, score, wave, duration, played_at=None):
+        # kopia w pamięci od razu, baza w tle
+        run = (int(score), int(wave), float(duration), time.time() if played_at is None else played_at)
+        self.top.append(run)
+        self.top.sort(key=lambda r: (-r[0], r[3]))
+        del self.top[self.size:]
+        self.best = max(self.best, run[0])
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._writer, name="leaderboard", daemon=True)
+            self._thread.start()
+        self._queue.put(run)
+
+    def _writer(self):
+        # połączenie SQLite należy do wątku, który je otworzył
+        conn = None
+        while True:
+            run = self._queue.get()
+            if run is None:
+                break
+            try:
+                if conn is None:
+                    conn = _connect(self.path)
+                with conn:
+                    conn.execute("INSERT INTO runs (score, wave, duration, played_at) VALUES (?, ?, ?, ?)", run)
+            except sqlite3.Error:
+                pass
+        if conn is not None:
+            conn.close()
+
+    def close(self, timeout=2.0):
+        # dokończenie zaległych zapisów przy wyjściu z gry
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
@@ -1,7 +1,43 @@
+import time
+
+STARTED_AT = time.perf_counter()
+
+import argparse
+
+from assets import ASSETS
 from game import Game
 
 def main():
-    Game().run()
+    parser = argparse.ArgumentParser(description="Tower Defense: Obrona Stacji")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="odświeżaj tylko zmienione prostokąty zamiast całego ekranu")
+    parser.add_argument("--hide-full-health-bars", action="store_true",
+                        help="nie rysuj pasków zdrowia przeciwników z pełnym hp")
+    parser.add_argument("--asset-report", action="store_true",
+                        help="wypisz pamięć i czas wczytywania obrazków przy wyjściu")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="wypisz czasy etapów startu do pierwszej klatki")
+    parser.add_argument("--preload-assets", action="store_true",
+                        help="wczytaj wszystkie obrazki przy starcie zamiast po START")
+    parser.add_argument("--profile", action="store_true",
+                        help="włącz nakładkę profilera od startu (F3 przełącza)")
+    parser.add_argument("--profile-csv", metavar="PLIK", default=None,
+                        help="zapisuj czasy faz każdej profilowanej klatki do CSV")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="ziarno losowości gry (domyślnie losowe)")
+    parser.add_argument("--record-replay", metavar="PLIK", default=None,
+                        help="nagrywaj komendy gracza do pliku powtórki (odtwarzanie: replay.py)")
+    parser.add_argument("--speed", type=int, choices=(1, 2, 4, 8), default=1,
+                        help="prędkość gry na starcie (F przełącza)")
+    args = parser.parse_args()
+
+    game = Game(dirty_rects=args.dirty_rects, hide_full_health_bars=args.hide_full_health_bars,
+                preload_assets=args.preload_assets, startup_report=args.startup_report, started_at=STARTED_AT,
+                profile=args.profile, profile_csv=args.profile_csv,
+                seed=args.seed, record_replay=args.record_replay, time_scale=args.speed)
+    game.run()
+    if args.asset_report:
+        print(ASSETS.report())
 
 if __name__ == "__main__":
     main()
@@ -19,6 +19,59 @@ WAYPOINTS = [
 
 PATH_WIDTH = 44
 _STAR_CACHE = None
+_PATH_TABLES = {}
+_LAST_PATH_TABLE = [None]
+_BUILD_MASKS = {}
+
+
+# Ścieżka sparametryzowana długością łuku: skumulowane długości odcinków
+# i ich kierunki. Przeciwnik to jedna liczba (dystans od startu), a pozycja
+# jest odczytywana z tabeli, z resztą przenoszoną na kolejny odcinek.
+class PathTable:
+    def __init__(self, waypoints):
+        self.waypoints = [(float(x), float(y)) for x, y in waypoints]
+        self.starts = []
+        self.dirs = []
+        total = 0.0
+        for (ax, ay), (bx, by) in zip(self.waypoints, self.waypoints[1:]):
+            seg = sqrt((bx - ax) ** 2 + (by - ay) ** 2)
+            self.starts.append(total)
+            self.dirs.append(((bx - ax) / seg, (by - ay) / seg) if seg > 0 else (0.0, 0.0))
+            total += seg
+        self.length = total
+        self.end = self.waypoints[-1]
+
+    def segment_at(self, s, hint=0):
+        # przeciwnicy idą tylko do przodu, więc wystarczy przesuwać podpowiedź
+        starts = self.starts
+        i = max(0, hint)
+        last = len(starts) - 1
+        while i < last and starts[i + 1] <= s:
+            i += 1
+        return i
+
+    def position(self, s, hint=0):
+        if not self.starts:
+            return self.end[0], self.end[1], 0
+        i = self.segment_at(s, hint)
+        ax, ay = self.waypoints[i]
+        ux, uy = self.dirs[i]
+        t = s - self.starts[i]
+        return ax + ux * t, ay + uy * t, i
+
+
+def get_path_table(waypoints):
+    # ta sama lista co ostatnio (zwykle WAYPOINTS): bez budowania klucza przy każdym spawnie
+    last = _LAST_PATH_TABLE[0]
+    if last is not None and last[0] is waypoints:
+        return last[1]
+    key = tuple((float(x), float(y)) for x, y in waypoints)
+    table = _PATH_TABLES.get(key)
+    if table is None:
+        table = PathTable(key)
+        _PATH_TABLES[key] = table
+    _LAST_PATH_TABLE[0] = (waypoints, table)
+    return table
 
 def draw_background(screen):
     global _STAR_CACHE
@@ -37,14 +90,49 @@ def draw_background(screen):
     for x, y, r, bright in _STAR_CACHE:
         pygame.draw.circle(screen, (bright, bright, bright), (x, y), r)
 
-def draw_path(screen):
-    if len(WAYPOINTS) >= 2:
-        pygame.draw.lines(screen, (35, 35, 55), False, WAYPOINTS, PATH_WIDTH)
-        pygame.draw.lines(screen, (80, 80, 120), False, WAYPOINTS, 3)
+def draw_path(screen, waypoints=WAYPOINTS):
+    if len(waypoints) >= 2:
+        pygame.draw.lines(screen, (35, 35, 55), False, waypoints, PATH_WIDTH)
+        pygame.draw.lines(screen, (80, 80, 120), False, waypoints, 3)
 
-    for p in WAYPOINTS:
+    for p in waypoints:
         pygame.draw.circle(screen, (120, 120, 170), p, 4)
 
+
+# Tło, ścieżka i baza rysowane raz do osobnej powierzchni; co klatkę jest
+# tylko jeden blit. Warstwa jest odświeżana tylko gdy zmieni się mapa,
+# rozmiar okna albo sprite bazy.
+class StaticLayer:
+    def __init__(self):
+        self.surface = None
+        self._size = None
+        self._waypoints = None
+        self._base = None
+
+    def invalidate(self):
+        self.surface = None
+
+    def get(self, screen, waypoints=WAYPOINTS, base_sprite=None, base_center=None):
+        size = screen.get_size()
+        base = (base_sprite, base_center)
+        if (self.surface is None or size != self._size
+                or waypoints is not self._waypoints or base != self._base):
+            self.surface = self._render(size, waypoints, base_sprite, base_center)
+            self._size = size
+            self._waypoints = waypoints
+            self._base = base
+        return self.surface
+
+    def _render(self, size, waypoints, base_sprite, base_center):
+        surf = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+        draw_background(surf)
+        draw_path(surf, waypoints)
+        if base_sprite is not None:
+            surf.blit(base_sprite, base_sprite.get_rect(center=base_center))
+        return surf
+
 def dist(a, b):
     return sqrt((a[0]-b[0])**2 + (a[1]-b[1])**2)
 
@@ -66,9 +154,99 @@ def point_to_segment_distance(p, a, b):
     cy = ay + t * aby
     return dist(p, (cx, cy))
 
-def is_on_path(pos):
-    for i in range(len(WAYPOINTS) - 1):
-        d = point_to_segment_distance(pos, WAYPOINTS[i], WAYPOINTS[i+1])
+def is_on_path(pos, waypoints=WAYPOINTS):
+    for i in range(len(waypoints) - 1):
+        d = point_to_segment_distance(pos, waypoints[i], waypoints[i+1])
         if d <= PATH_WIDTH * 0.55:
             return True
     return False
+
+
+# Mapa budowalności: jeden bajt na piksel ekranu (1 = można stawiać).
+# Korytarz ścieżki liczony jest raz: w każdym wierszu odcinek zajmuje przedział x
+# (odległość od odcinka jest wypukła), którego końce szukamy binarnie tym samym
+# testem co is_on_path - dla całkowitych pozycji myszy wynik jest identyczny.
+class BuildMask:
+    def __init__(self, waypoints=WAYPOINTS, size=(SCREEN_W, SCREEN_H), blocked=()):
+        self.w, self.h = size
+        self.bits = bytearray(b"\x01") * (self.w * self.h)
+        r = PATH_WIDTH * 0.55
+        for i in range(len(waypoints) - 1):
+            self._block_segment(waypoints[i], waypoints[i+1], r)
+        for rect in blocked:
+            self._block_rect(rect)
+
+    def _block_rect(self, rect):
+        rect = pygame.Rect(rect).clip((0, 0, self.w, self.h))
+        empty = bytes(rect.w)
+        for y in range(rect.top, rect.bottom):
+            i = y * self.w + rect.left
+            self.bits[i:i + rect.w] = empty
+
+    def _block_segment(self, a, b, r):
+        w = self.w
+        ay, by = a[1], b[1]
+        top, bottom = min(ay, by), max(ay, by)
+
+        for y in range(max(0, int(top - r) - 1), min(self.h, int(bottom + r) + 2)):
+            # najbliższy punkt odcinka dla tego wiersza
+            cy = clamp(y, top, bottom)
+            cx = a[0] if ay == by else a[0] + (b[0] - a[0]) * (cy - ay) / (by - ay)
+
+            # minimum na liczbach całkowitych leży obok cx
+            x0 = clamp(int(cx), 0, w - 1)
+            if point_to_segment_distance((x0, y), a, b) > r:
+                x0 = min(x0 + 1, w - 1)
+                if point_to_segment_distance((x0, y), a, b) > r:
+                    continue
+
+            # lewy koniec: najmniejsze x z korytarza
+            lo, hi = 0, x0
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if point_to_segment_distance((mid, y), a, b) <= r:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            left = lo
+
+            # prawy koniec: największe x z korytarza
+            lo, hi = x0, w - 1
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if point_to_segment_distance((mid, y), a, b) <= r:
+                    lo = mid
+                else:
+                    hi = mid - 1
+            right = lo
+
+            i = y * w
+            self.bits[i + left:i + right + 1] = bytes(right - left + 1)
+
+    def buildable(self, pos):
+        x, y = int(pos[0]), int(pos[1])
+        if 0 <= x < self.w and 0 <= y < self.h:
+            return self.bits[y * self.w + x] == 1
+        return False
+
+
+def get_build_mask(waypoints=WAYPOINTS, size=(SCREEN_W, SCREEN_H), blocked=()):
+    # maska zależy tylko od mapy, więc nowa gra korzysta z tej samej
+    key = (tuple(waypoints), tuple(size), tuple(tuple(r) for r in blocked))
+    mask = _BUILD_MASKS.get(key)
+    if mask is None:
+        mask = _BUILD_MASKS[key] = BuildMask(waypoints, size, blocked)
+    return mask
+
+
+def tower_spots(mask, waypoints=WAYPOINTS, step=40):
+    # siatka możliwych miejsc na wieże, najbliższe ścieżce najpierw (tam wieże faktycznie strzelają)
+    segments = list(zip(waypoints, waypoints[1:]))
+    spots = []
+    for y in range(step // 2, mask.h, step):
+        for x in range(step // 2, mask.w, step):
+            if mask.buildable((x, y)):
+                d = min(point_to_segment_distance((x, y), a, b) for a, b in segments)
+                spots.append((d, y, x))
+    spots.sort()
+    return [(x, y) for _, y, x in spots]
@@ -0,0 +1,62 @@
+# Pule obiektów dla encji tworzonych masowo (przeciwnicy, pociski, promienie).
+# Zamiast tworzyć nowy obiekt przy każdym strzale, martwe obiekty wracają
+# do puli i są ponownie inicjalizowane przez reset().
+class Pool:
+    enabled = True
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+            return obj
+        self.created += 1
+        return self.cls(*args, **kwargs)
+
+    def release(self, obj):
+        if Pool.enabled:
+            self.free.append(obj)
+
+    def clear(self):
+        self.free.clear()
+        self.created = 0
+        self.reused = 0
+
+
+_POOLS = {}
+
+
+def pool_for(cls):
+    pool = _POOLS.get(cls)
+    if pool is None:
+        pool = Pool(cls)
+        _POOLS[cls] = pool
+    return pool
+
+
+def pool_stats():
+    return {cls.__name__: (p.created, p.reused, len(p.free)) for cls, p in _POOLS.items()}
+
+
+def set_pooling(enabled):
+    # wyłączenie pul (do porównań) - release() przestaje zwracać obiekty
+    Pool.enabled = bool(enabled)
+    for p in _POOLS.values():
+        p.free.clear()
+
+
+class Pooled:
+    __slots__ = ()
+
+    @classmethod
+    def acquire(cls, *args, **kwargs):
+        return pool_for(cls).acquire(*args, **kwargs)
+
+    def release(self):
+        pool_for(type(self)).release(self)
@@ -0,0 +1,82 @@
+import csv
+from collections import deque
+from time import perf_counter
+
+# kolejność faz w nakładce i kolumn w CSV (r: = rysowanie)
+PHASES = (
+    "zdarzenia", "timery", "ruch", "fale", "boss", "baza", "wieże", "pociski", "nagrody", "sprzątanie",
+    "r:tło", "r:wieże", "r:lasery", "r:wrogowie", "r:pociski", "r:hud", "flip",
+)
+
+
+# Czasy faz klatki (symulacja + rysowanie) do nakładki pod F3.
+# Wyłączony profiler nie jest w ogóle wołany: Game i Simulation trzymają
+# None zamiast niego i sprawdzają tylko "is not None".
+class FrameProfiler:
+    def __init__(self, window=240):
+        self.enabled = False
+        self.history = deque(maxlen=window)
+        self.current = {}
+        self.frame = 0
+        self._last = 0.0
+        self._frame_t = 0.0
+        self._csv_file = None
+        self._csv = None
+
+    def begin_frame(self):
+        self._frame_t = self._last = perf_counter()
+        self.current = {}
+
+    def mark(self, phase):
+        # czas od poprzedniego znacznika dopisywany do fazy (sumuje się przy kilku krokach symulacji)
+        now = perf_counter()
+        cur = self.current
+        cur[phase] = cur.get(phase, 0.0) + (now - self._last)
+        self._last = now
+
+    def end_frame(self, counts):
+        cur = self.current
+        cur["klatka"] = perf_counter() - self._frame_t
+        self.history.append(cur)
+        self.frame += 1
+        if self._csv is not None:
+            self._csv.writerow(
+                [self.frame, f"{cur['klatka'] * 1000:.3f}"]
+                + [f"{cur.get(p, 0.0) * 1000:.3f}" for p in PHASES]
+                + [counts.get(k, 0) for k in ("enemies", "towers", "bullets", "beams", "steps")]
+            )
+
+    # -------------------- CSV --------------------
+
+    def open_csv(self, path):
+        self.close_csv()
+        self._csv_file = open(path, "w", newline="", encoding="utf-8")
+        self._csv = csv.writer(self._csv_file)
+        self._csv.writerow(["frame", "klatka"] + list(PHASES) + ["enemies", "towers", "bullets", "beams", "steps"])
+
+    def close_csv(self):
+        if self._csv_file is not None:
+            self._csv_file.close()
+        self._csv_file = None
+        self._csv = None
+
+    # -------------------- STATYSTYKI --------------------
+
+    def stats(self, phase):
+        # (średnia, p99) w ms z okna ostatnich klatek
+        values = sorted(f.get(phase, 0.0) for f in self.history)
+        if not values:
+            return 0.0, 0.0
+        return sum(values) / len(values) * 1000, values[int(0.99 * (len(values) - 1))] * 1000
+
+    def report(self, counts):
+        lines = [f"{'faza':<12}{'śr. ms':>8}{'p99 ms':>8}"]
+        for phase in ("klatka",) + PHASES:
+            avg, p99 = self.stats(phase)
+            lines.append(f"{phase:<12}{avg:>8.2f}{p99:>8.2f}")
+        lines.append(
+            f"wrogowie {counts['enemies']}  wieże {counts['towers']}  "
+            f"pociski {counts['bullets']}  lasery {counts['beams']}"
+        )
+        lines.append(f"kroki sym. {counts['steps']}  fps {counts['fps']:.0f}")
+        return lines
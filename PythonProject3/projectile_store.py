@@ -0,0 +1,186 @@
+import pygame
+
+from entities import Bullet
+
+try:
+    import numpy as np
+except ImportError:  # numpy jest opcjonalne, domyślny backend to zwykłe obiekty
+    np = None
+
+
+class BulletView(Bullet):
+    # Lekki widok na jeden pocisk w ProjectileStore, używany tylko do rysowania
+    # (Bullet.draw: koło dla cannon, gwiazdka dla slow).
+    __slots__ = ("store", "slot")
+
+    def __init__(self, store, slot):
+        self.store = store
+        self.slot = slot
+
+    @property
+    def alive(self):
+        return bool(self.store.alive[self.slot])
+
+    @property
+    def pos(self):
+        s = self.store
+        return pygame.Vector2(s.x[self.slot], s.y[self.slot])
+
+    @property
+    def prev(self):
+        s = self.store
+        return pygame.Vector2(s.prev_x[self.slot], s.prev_y[self.slot])
+
+    @property
+    def kind(self):
+        return self.store.kinds[self.store.kind[self.slot]]
+
+    @property
+    def radius(self):
+        return self.store.radius[self.slot].item()
+
+    @property
+    def _t(self):
+        return self.store.t[self.slot].item()
+
+
+# Pociski jako tablice numpy: pozycja, prędkość, obrażenia, rodzaj, ładunek
+# spowolnienia i indeks celu w EnemyStore. Naprowadzanie, trafienia,
+# obrażenia i spowolnienia liczone są jednym wektorowym przebiegiem na tick.
+class ProjectileStore:
+    FLOAT_FIELDS = ("x", "y", "prev_x", "prev_y", "speed", "dmg", "radius", "t", "slow_factor", "slow_duration")
+    INT_FIELDS = ("kind", "target", "target_gen")
+    BOOL_FIELDS = ("alive", "has_slow")
+
+    def __init__(self, enemies, capacity=128):
+        if np is None:
+            raise ImportError("ProjectileStore wymaga pakietu numpy")
+        self.enemies = enemies
+        self.kinds = ["cannon", "slow"]
+        self.capacity = 0
+        self.free = []
+        self.count = 0
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        old = self.capacity
+        for name in self.FLOAT_FIELDS:
+            self._resize(name, np.float64, capacity, old)
+        for name in self.INT_FIELDS:
+            self._resize(name, np.int64, capacity, old)
+        for name in self.BOOL_FIELDS:
+            self._resize(name, np.bool_, capacity, old)
+        self.free.extend(range(capacity - 1, old - 1, -1))
+        self.capacity = capacity
+
+    def _resize(self, name, dtype, capacity, old):
+        arr = np.zeros(capacity, dtype=dtype)
+        if old:
+            arr[:old] = getattr(self, name)
+        setattr(self, name, arr)
+
+    def _kind_code(self, kind):
+        if kind not in self.kinds:
+            self.kinds.append(kind)
+        return self.kinds.index(kind)
+
+    # -------------------- DODAWANIE / USUWANIE --------------------
+
+    def append(self, bullet):
+        # wieże tworzą zwykłe Bullet z celem EnemyView, tu zamieniamy cel na slot
+        target = bullet.target
+        if target is None or not target.alive:
+            bullet.release()
+            return
+        if not self.free:
+            self._grow(self.capacity * 2)
+        i = self.free.pop()
+
+        self.x[i] = bullet.pos.x
+        self.y[i] = bullet.pos.y
+        self.prev_x[i] = bullet.prev.x
+        self.prev_y[i] = bullet.prev.y
+        self.speed[i] = bullet.speed
+        self.dmg[i] = bullet.dmg
+        self.radius[i] = bullet.radius
+        self.t[i] = bullet._t
+        self.kind[i] = self._kind_code(bullet.kind)
+        self.target[i] = target.slot
+        self.target_gen[i] = target.gen
+        self.alive[i] = True
+        if bullet.slow is not None:
+            self.has_slow[i] = True
+            self.slow_factor[i], self.slow_duration[i] = bullet.slow
+        else:
+            self.has_slow[i] = False
+        self.count += 1
+
+        # stan jest już w tablicach, obiekt wraca do puli
+        bullet.release()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for i in np.flatnonzero(self.alive).tolist():
+            yield BulletView(self, i)
+
+    def _kill(self, idx):
+        # slot wraca od razu do listy wolnych, osobne compact() nie jest potrzebne
+        self.alive[idx] = False
+        self.free.extend(idx.tolist())
+        self.count -= len(idx)
+
+    # -------------------- KROK --------------------
+
+    def update(self, dt):
+        a = np.flatnonzero(self.alive)
+        if len(a) == 0:
+            return
+        self.t[a] += dt
+
+        en = self.enemies
+        tg = self.target[a]
+        valid = en.alive[tg] & (en.gen[tg] == self.target_gen[a])
+        if not valid.all():
+            self._kill(a[~valid])
+            a = a[valid]
+            tg = tg[valid]
+            if len(a) == 0:
+                return
+
+        self.prev_x[a] = self.x[a]
+        self.prev_y[a] = self.y[a]
+
+        # naprowadzanie na aktualną pozycję celu
+        tx = en.x[tg]
+        ty = en.y[tg]
+        vx = tx - self.x[a]
+        vy = ty - self.y[a]
+        d = np.hypot(vx, vy)
+        safe = np.where(d == 0, 1.0, d)
+        step = self.speed[a] * dt
+        x = self.x[a] + np.where(d == 0, 0.0, vx / safe) * step
+        y = self.y[a] + np.where(d == 0, 0.0, vy / safe) * step
+        self.x[a] = x
+        self.y[a] = y
+
+        hit = np.hypot(tx - x, ty - y) <= self.radius[a] + en.radius[tg]
+        if not hit.any():
+            return
+        h = a[hit]
+        ht = tg[hit]
+
+        # obrażenia zbiorczo (kilka pocisków może trafić ten sam cel)
+        np.subtract.at(en.hp, ht, self.dmg[h])
+        en.alive[ht] &= en.hp[ht] > 0
+
+        # spowolnienie tylko dla celów, które przeżyły
+        slowed = self.has_slow[h] & en.alive[ht]
+        if slowed.any():
+            sh = h[slowed]
+            st = ht[slowed]
+            np.minimum.at(en.slow_factor, st, self.slow_factor[sh])
+            np.maximum.at(en.slow_timer, st, self.slow_duration[sh])
+
+        self._kill(h)
@@ -0,0 +1,99 @@
+# Rejestr encji ze stabilnymi uchwytami generacyjnymi.
+# Obiekty leżą w gęstej liście (szybka iteracja), usuwanie to zamiana
+# z ostatnim elementem - O(1). Uchwyt = generacja << INDEX_BITS | indeks,
+# więc uchwyt do usuniętej encji przestaje być ważny nawet gdy jej indeks
+# (albo sam obiekt z puli) zostanie użyty ponownie.
+INDEX_BITS = 20
+INDEX_MASK = (1 << INDEX_BITS) - 1
+
+
+class EntityRegistry:
+    def __init__(self):
+        self.dense = []
+        self._dense_ids = []
+        self._sparse = []
+        self._gen = []
+        self._free = []
+
+    # -------------------- UCHWYTY --------------------
+
+    def add(self, obj):
+        if self._free:
+            idx = self._free.pop()
+        else:
+            idx = len(self._gen)
+            self._gen.append(1)
+            self._sparse.append(-1)
+        self._sparse[idx] = len(self.dense)
+        self.dense.append(obj)
+        self._dense_ids.append(idx)
+        handle = (self._gen[idx] << INDEX_BITS) | idx
+        obj.handle = handle
+        return handle
+
+    append = add
+
+    def valid(self, handle):
+        idx = handle & INDEX_MASK
+        return 0 < handle and idx < len(self._gen) and self._gen[idx] == handle >> INDEX_BITS
+
+    def get(self, handle):
+        if not self.valid(handle):
+            return None
+        return self.dense[self._sparse[handle & INDEX_MASK]]
+
+    def index_of(self, obj):
+        # pozycja w gęstej liście, czyli w kolejności iteracji
+        return self._sparse[obj.handle & INDEX_MASK]
+
+    def __contains__(self, obj):
+        return self.get(getattr(obj, "handle", 0)) is obj
+
+    # -------------------- USUWANIE --------------------
+
+    def remove(self, obj):
+        handle = obj.handle
+        if not self.valid(handle):
+            return False
+        idx = handle & INDEX_MASK
+        pos = self._sparse[idx]
+
+        # zamiana z ostatnim elementem zamiast przesuwania listy
+        last = self.dense.pop()
+        last_id = self._dense_ids.pop()
+        if pos < len(self.dense):
+            self.dense[pos] = last
+            self._dense_ids[pos] = last_id
+            self._sparse[last_id] = pos
+
+        self._sparse[idx] = -1
+        self._gen[idx] += 1
+        self._free.append(idx)
+        obj.handle = 0
+        return True
+
+    def compact(self, keep, on_remove=None):
+        # od końca, więc element przeniesiony przez zamianę jest już sprawdzony
+        dense = self.dense
+        for i in range(len(dense) - 1, -1, -1):
+            obj = dense[i]
+            if not keep(obj):
+                self.remove(obj)
+                if on_remove is not None:
+                    on_remove(obj)
+
+    def clear(self):
+        for obj in self.dense:
+            obj.handle = 0
+        self.__init__()
+
+    # -------------------- LISTA --------------------
+
+    def __iter__(self):
+        return iter(self.dense)
+
+    def __len__(self):
+        return len(self.dense)
+
+    def __getitem__(self, i):
+        return self.dense[i]
@@ -0,0 +1,44 @@
+import pygame
+
+
+# Renderer "dirty rect": zamiast malować cały ekran i robić flip(), zapamiętuje
+# prostokąty narysowane w poprzedniej klatce, przywraca je z warstwy tła
+# i wysyła do okna tylko zmienione obszary przez display.update(rects).
+# Gdy brudny obszar jest za duży, wraca do pełnego flip().
+class DirtyRenderer:
+    def __init__(self, full_threshold=0.5):
+        self.full_threshold = full_threshold
+        self.prev_rects = []
+        self._layer = None
+        self.full_frames = 0
+        self.partial_frames = 0
+
+    def invalidate(self):
+        # np. po menu - następna klatka maluje całe tło
+        self._layer = None
+        self.prev_rects = []
+
+    def begin(self, screen, layer):
+        if layer is not self._layer:
+            screen.blit(layer, (0, 0))
+            self._layer = layer
+            self.prev_rects = [screen.get_rect()]
+            return
+        for r in self.prev_rects:
+            screen.blit(layer, r, r)
+
+    def present(self, screen, rects):
+        bounds = screen.get_rect()
+        cur = [bounds.clip(r) for r in rects if r]
+        dirty = self.prev_rects + cur
+        self.prev_rects = cur
+
+        area = 0
+        for r in dirty:
+            area += r.w * r.h
+        if area > self.full_threshold * bounds.w * bounds.h:
+            self.full_frames += 1
+            pygame.display.flip()
+        else:
+            self.partial_frames += 1
+            pygame.display.update(dirty)
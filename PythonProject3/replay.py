@@ -0,0 +1,207 @@
+# Powtórki: ziarno gry + komendy gracza (budowa, ulepszenie, następna fala)
+# z numerami ticków w małym pliku binarnym. Symulacja jest deterministyczna
+# (stały krok, RandomStreams), więc odtworzenie komend daje tę samą grę.
+# Odtwarzanie headless: python replay.py gra.tdr [--until TICK] [--repeat N]
+import argparse
+import os
+import struct
+import sys
+import time
+
+from map_data import WAYPOINTS
+from simulation import Simulation, TOWER_TYPES
+
+MAGIC = b"TDRP"
+VERSION = 5
+BACKENDS = ("objects", "numpy")
+TOWER_MODES = tuple(TOWER_TYPES)
+
+CMD_WAVE, CMD_BUILD, CMD_UPGRADE, CMD_END = 0, 1, 2, 255
+
+_HEADER = struct.Struct("<4sBQdBB")    # magic, wersja, ziarno, dt, backend, sprite'y gry
+_CMD = struct.Struct("<IB")            # tick, komenda
+_BUILD = struct.Struct("<Bdd")         # rodzaj wieży, x, y
+_UPGRADE = struct.Struct("<dd")        # pozycja wieży
+_DIGEST = struct.Struct("<iiqqI")      # fala, hp bazy, kredyty, wynik, wieże
+
+
+class ReplayError(ValueError):
+    pass
+
+
+def digest(sim):
+    # skrót stanu do sprawdzenia, czy odtworzenie doszło do tego samego miejsca
+    return (sim.wave_manager.wave, int(sim.base_hp), int(sim.credits), int(sim.score), len(sim.towers))
+
+
+class Replay:
+    def __init__(self, seed, dt, backend="objects", sprites=True):
+        self.seed = seed
+        self.dt = dt
+        self.backend = backend
+        # czy grano ze sprite'ami gry (od ich rozmiaru zależą promienie kolizji)
+        self.sprites = sprites
+        self.commands = []
+        self.end_tick = 0
+        self.digest = None
+
+    # -------------------- NAGRYWANIE --------------------
+
+    @classmethod
+    def record_into(cls, sim, sprites=True):
+        replay = cls(sim.seed, sim.dt, sim.enemy_backend, sprites)
+        sim.recorder = replay
+        return replay
+
+    def record(self, tick, cmd, *args):
+        self.commands.append((tick, cmd) + args)
+
+    def save(self, path, sim):
+        self.end_tick = sim.tick
+        self.digest = digest(sim)
+        with open(path, "wb") as f:
+            f.write(self.encode())
+
+    # -------------------- FORMAT --------------------
+
+    def encode(self):
+        out = [_HEADER.pack(MAGIC, VERSION, self.seed, self.dt, BACKENDS.index(self.backend), int(self.sprites))]
+        for tick, cmd, *args in self.commands:
+            if cmd == "wave":
+                out.append(_CMD.pack(tick, CMD_WAVE))
+            elif cmd == "build":
+                mode, x, y = args
+                out.append(_CMD.pack(tick, CMD_BUILD) + _BUILD.pack(TOWER_MODES.index(mode), x, y))
+            elif cmd == "upgrade":
+                out.append(_CMD.pack(tick, CMD_UPGRADE) + _UPGRADE.pack(*args))
+        out.append(_CMD.pack(self.end_tick, CMD_END) + _DIGEST.pack(*self.digest))
+        return b"".join(out)
+
+    @classmethod
+    def decode(cls, data):
+        # ucięty lub uszkodzony plik kończy się ReplayError, jak SaveError w savegame
+        try:
+            return cls._decode(data)
+        except ReplayError:
+            raise
+        except (struct.error, IndexError) as e:
+            raise ReplayError(f"uszkodzony plik powtórki: {e}") from e
+
+    @classmethod
+    def _decode(cls, data):
+        magic, version, seed, dt, backend, sprites = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ReplayError("to nie jest plik powtórki")
+        if version != VERSION:
+            raise ReplayError(f"nieobsługiwana wersja powtórki: {version}")
+        if not 0 < dt <= 1.0:
+            raise ReplayError(f"nieprawidłowy krok symulacji: {dt}")
+        replay = cls(seed, dt, BACKENDS[backend], bool(sprites))
+
+        off = _HEADER.size
+        while True:
+            tick, cmd = _CMD.unpack_from(data, off)
+            off += _CMD.size
+            if cmd == CMD_WAVE:
+                replay.commands.append((tick, "wave"))
+            elif cmd == CMD_BUILD:
+                mode, x, y = _BUILD.unpack_from(data, off)
+                off += _BUILD.size
+                replay.commands.append((tick, "build", TOWER_MODES[mode], x, y))
+            elif cmd == CMD_UPGRADE:
+                x, y = _UPGRADE.unpack_from(data, off)
+                off += _UPGRADE.size
+                replay.commands.append((tick, "upgrade", x, y))
+            elif cmd == CMD_END:
+                replay.end_tick = tick
+                replay.digest = _DIGEST.unpack_from(data, off)
+                return replay
+            else:
+                raise ReplayError(f"nieznana komenda {cmd} w ticku {tick}")
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.decode(f.read())
+
+    # -------------------- ODTWARZANIE --------------------
+
+    def new_simulation(self, sprites=(None, None, None)):
+        enemy_sprites, boss_sprite, tower_sprites = sprites
+        return Simulation(
+            WAYPOINTS,
+            enemy_sprites=enemy_sprites,
+            boss_sprite=boss_sprite,
+            tower_sprites=tower_sprites,
+            dt=self.dt,
+            enemy_backend=self.backend,
+            seed=self.seed
+        )
+
+    def apply(self, sim, command):
+        tick, cmd, *args = command
+        if cmd == "wave":
+            ok = sim.start_next_wave()
+        elif cmd == "build":
+            mode, x, y = args
+            ok = sim.try_build_tower((x, y), mode) is not None
+        else:
+            x, y = args
+            tower = next((t for t in sim.tower_grid.query(x, y, 1) if t.pos.x == x and t.pos.y == y), None)
+            ok = sim.try_upgrade(tower)
+        if not ok:
+            raise ReplayError(f"komenda {cmd} {args} nie powiodła się w ticku {tick} - powtórka się rozjechała")
+
+    def play(self, sim, until=None):
+        # komendy z ticku N wykonywane są po N krokach, tak jak między klatkami w Game
+        end = self.end_tick if until is None else min(until, self.end_tick)
+        commands = self.commands
+        i = 0
+        while True:
+            while i < len(commands) and commands[i][0] <= sim.tick:
+                self.apply(sim, commands[i])
+                i += 1
+            if sim.tick >= end or sim.game_over:
+                return sim
+            sim.step()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Odtwarzanie powtórki bez okna, z maksymalną prędkością")
+    ap.add_argument("path")
+    ap.add_argument("--until", type=int, default=None, help="zatrzymaj na tym ticku")
+    ap.add_argument("--repeat", type=int, default=1, help="ile razy odtworzyć (pomiar prędkości)")
+    args = ap.parse_args()
+
+    try:
+        replay = Replay.load(args.path)
+    except (OSError, ReplayError) as e:
+        ap.error(str(e))
+    sprites = (None, None, None)
+    if replay.sprites:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        from game import load_sprites
+        sprites = load_sprites(headless=True)
+
+    print(f"ziarno {replay.seed}, backend {replay.backend}, {len(replay.commands)} komend, "
+          f"{replay.end_tick} ticków")
+    best = None
+    for _ in range(args.repeat):
+        sim = replay.new_simulation(sprites)
+        t0 = time.perf_counter()
+        replay.play(sim, args.until)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{sim.tick} ticków w {best:.3f} s ({sim.tick / max(best, 1e-9):.0f} ticków/s)")
+
+    state = digest(sim)
+    print(f"fala {state[0]}, hp bazy {state[1]}, kredyty {state[2]}, wynik {state[3]}, wieże {state[4]}")
+    if args.until is None or args.until >= replay.end_tick:
+        if state != tuple(replay.digest):
+            print(f"NIEZGODNE z nagraniem: {tuple(replay.digest)}")
+            sys.exit(1)
+        print("zgodne z nagraniem")
+
+
+if __name__ == "__main__":
+    main()
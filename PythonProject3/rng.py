@@ -0,0 +1,21 @@
+import random
+
+
+# Osobne, powtarzalne strumienie losowości dla podsystemów symulacji.
+# Ziarno każdego strumienia wynika z ziarna gry i nazwy strumienia, więc np.
+# dodatkowe losowanie w animacji wież nie zmienia tego, którą wieżę zniszczy boss.
+class RandomStreams:
+    def __init__(self, seed=None):
+        if seed is None:
+            # z globalnego random: bez ziarna gra jest losowa, a random.seed() w skryptach nadal działa
+            seed = random.getrandbits(64)
+        # 64 bity, żeby ziarno mieściło się w nagłówku powtórki
+        self.seed = int(seed) & ((1 << 64) - 1)
+        self._streams = {}
+
+    def __getitem__(self, name):
+        rng = self._streams.get(name)
+        if rng is None:
+            rng = random.Random(f"{self.seed}:{name}")
+            self._streams[name] = rng
+        return rng
@@ -0,0 +1,325 @@
+# Zapis i odczyt pełnego stanu gry w trakcie fali (zwarty, wersjonowany format binarny).
+# Każda encja to jeden rekord struct o stałym układzie, cele pocisków i promieni
+# są indeksami w liście zapisanych przeciwników. Zapisywane są też stany strumieni
+# losowości, więc wczytana gra toczy się dalej dokładnie tak jak oryginał.
+import heapq
+import os
+import struct
+
+from map_data import WAYPOINTS
+from entities import Enemy, BossEnemy, Bullet, Beam
+from simulation import Simulation, TOWER_TYPES
+from wave import SpawnEvent, SPRITE_NONE, SPRITE_BOSS
+
+try:
+    import numpy as np
+except ImportError:  # numpy potrzebne tylko dla backendu "numpy"
+    np = None
+
+SAVE_FILE = os.path.join(os.path.dirname(__file__), "savegame.tds")   # szybki zapis z gry (F5 / F9)
+
+MAGIC = b"TDSV"
+VERSION = 3
+BACKENDS = ("objects", "numpy")
+TOWER_MODES = tuple(TOWER_TYPES)
+BULLET_KINDS = ("cannon", "slow")
+
+_HEADER = struct.Struct("<4sBQdB")      # magic, wersja, ziarno, dt, backend
+_STATE = struct.Struct("<Qdiqq?")       # tick, czas, hp bazy, kredyty, wynik, koniec gry
+_WAVE = struct.Struct("<id?I")          # fala, czas fali, aktywna, zdarzenia w harmonogramie
+_SPAWN = struct.Struct("<d?ddiidb")     # czas, boss?, hp, prędkość, nagroda, obrażenia bazy, cd bossa, sprite
+_COUNTS = struct.Struct("<IIIIB")       # wieże, przeciwnicy, pociski, promienie, strumienie rng
+_RNG = struct.Struct("<625I?d")         # stan Mersenne Twister, gauss_next
+_TOWER = struct.Struct("<BB10d")        # rodzaj, poziom, x, y, zasięg, cd, dmg, prędkość pocisku, gotowa od, anim, slow
+# przeciwnik: nazwy pól jak w EnemyStore, ten sam układ bajtów czyta struct i numpy
+ENEMY_FIELDS = (
+    ("is_boss", "B"), ("sprite", "b"), ("alive", "?"), ("reached", "?"), ("counted", "?"), ("kill_used", "?"),
+    ("wp_idx", "i"), ("reward", "i"), ("damage_to_base", "i"), ("hp_max", "i"),
+    ("hp", "d"), ("base_speed", "d"), ("speed", "d"), ("slow_factor", "d"), ("slow_timer", "d"),
+    ("distance", "d"), ("x", "d"), ("y", "d"), ("prev_x", "d"), ("prev_y", "d"), ("radius", "d"),
+    ("bob_t", "d"), ("kill_cd", "d"), ("kill_timer", "d"),
+)
+_ENEMY = struct.Struct("<" + "".join(code for _, code in ENEMY_FIELDS))
+_NP_CODES = {"B": "u1", "b": "i1", "?": "?", "i": "<i4", "d": "<f8"}
+_ENEMY_DTYPE = None if np is None else np.dtype([(name, _NP_CODES[code]) for name, code in ENEMY_FIELDS])
+_BULLET = struct.Struct("<Bi?10d")      # rodzaj, cel, slow?, x, y, prev x/y, prędkość, dmg, promień, t, slow
+_BEAM = struct.Struct("<i4d")           # cel, start x/y, dmg, koniec
+
+
+class SaveError(ValueError):
+    pass
+
+
+# -------------------- ZAPIS --------------------
+
+def _sprite_code(sprite, sim):
+    wm = sim.wave_manager
+    if sprite is None:
+        return SPRITE_NONE
+    if sprite is wm.boss_sprite:
+        return SPRITE_BOSS
+    for i, s in enumerate(wm.enemy_sprites):
+        if s is sprite:
+            return i
+    return SPRITE_NONE
+
+
+def _tower_record(t):
+    return _TOWER.pack(
+        TOWER_MODES.index(t.NAME), t.level, t.pos.x, t.pos.y, t.range, t.cooldown, t.damage,
+        t.bullet_speed, t.ready_at, t._anim_t,
+        getattr(t, "slow_factor", 0.0), getattr(t, "slow_duration", 0.0),
+    )
+
+
+def _enemy_records(sim):
+    # (rekordy, indeks celu dla obiektu/widoku przeciwnika)
+    index = {}
+    out = []
+    for i, e in enumerate(sim.enemies):
+        index[id(e)] = i
+        boss = getattr(e, "is_boss", False)
+        out.append(_ENEMY.pack(
+            int(boss), _sprite_code(e.sprite, sim), e.alive, e.reached_base, e._counted,
+            getattr(e, "used_tower_kill", False),
+            e.wp_idx, e.reward, e.damage_to_base, int(e.hp_max),
+            e.hp, e.base_speed, e.speed, e.slow_factor, e.slow_timer, e.distance,
+            e.pos.x, e.pos.y, e.prev_x, e.prev_y, e.radius, e._bob_t,
+            getattr(e, "tower_kill_cd", 0.0), getattr(e, "tower_kill_timer", 0.0),
+        ))
+    return out, index
+
+
+def _store_records(sim):
+    # EnemyStore: całe kolumny naraz do tablicy strukturalnej o układzie rekordu
+    s = sim.store
+    a = np.flatnonzero(s.alive)
+    rec = np.empty(len(a), dtype=_ENEMY_DTYPE)
+    for name, _ in ENEMY_FIELDS:
+        if name != "sprite":
+            rec[name] = getattr(s, name)[a]
+    slots = a.tolist()
+    rec["sprite"] = [_sprite_code(s.sprites[i], sim) for i in slots]
+    index = {id(s.views[i]): n for n, i in enumerate(slots)}
+    return [rec.tobytes()], len(slots), index, {i: n for n, i in enumerate(slots)}
+
+
+def _bullet_records(sim, index):
+    out = []
+    for b in sim.bullets:
+        target = index.get(id(b.target), -1) if b.has_target() else -1
+        slow = b.slow if b.slow is not None else (0.0, 0.0)
+        out.append(_BULLET.pack(
+            BULLET_KINDS.index(b.kind), target, b.slow is not None,
+            b.pos.x, b.pos.y, b.prev.x, b.prev.y, b.speed, b.dmg, b.radius, b._t, slow[0], slow[1],
+        ))
+    return out
+
+
+def _projectile_records(sim, slots):
+    p = sim.projectiles
+    a = np.flatnonzero(p.alive)
+    en = sim.store
+    tg = p.target[a]
+    valid = (en.alive[tg] & (en.gen[tg] == p.target_gen[a])).tolist()
+    targets = [slots.get(t, -1) if ok else -1 for t, ok in zip(tg.tolist(), valid)]
+    kinds = [BULLET_KINDS.index(p.kinds[k]) for k in p.kind[a].tolist()]
+    rows = zip(
+        kinds, targets, p.has_slow[a].tolist(), p.x[a].tolist(), p.y[a].tolist(), p.prev_x[a].tolist(),
+        p.prev_y[a].tolist(), p.speed[a].tolist(), p.dmg[a].tolist(), p.radius[a].tolist(), p.t[a].tolist(),
+        p.slow_factor[a].tolist(), p.slow_duration[a].tolist(),
+    )
+    return [_BULLET.pack(*row) for row in rows]
+
+
+def encode(sim):
+    if sim.store is not None:
+        enemies, n_enemies, index, slots = _store_records(sim)
+        bullets = _projectile_records(sim, slots)
+    else:
+        enemies, index = _enemy_records(sim)
+        n_enemies = len(enemies)
+        bullets = _bullet_records(sim, index)
+    towers = [_tower_record(t) for t in sim.towers]
+    beams = [
+        _BEAM.pack(index.get(id(b.target), -1) if b.has_target() else -1, b.start.x, b.start.y, b.dmg, b.expires_at)
+        for b in sim.beams
+    ]
+
+    streams = sim.rng._streams
+    wm = sim.wave_manager
+    out = [
+        _HEADER.pack(MAGIC, VERSION, sim.seed, sim.dt, BACKENDS.index(sim.enemy_backend)),
+        _STATE.pack(sim.tick, sim.time, int(sim.base_hp), int(sim.credits), int(sim.score), sim.game_over),
+        _WAVE.pack(wm.wave, wm.time, wm.active, len(wm.timeline)),
+    ]
+    # harmonogram w kolejności wypuszczania
+    out.extend(
+        _SPAWN.pack(e.time, e.boss, e.hp, e.speed, e.reward, e.damage_to_base, e.tower_kill_cd, e.sprite)
+        for _, _, e in sorted(wm.timeline)
+    )
+    out += [
+        _COUNTS.pack(len(towers), n_enemies, len(bullets), len(beams), len(streams)),
+    ]
+    for name, rng in streams.items():
+        _, words, gauss = rng.getstate()
+        raw = name.encode("utf-8")
+        out.append(bytes((len(raw),)) + raw + _RNG.pack(*words, gauss is not None, gauss or 0.0))
+    out.extend(towers)
+    out.extend(enemies)
+    out.extend(bullets)
+    out.extend(beams)
+    return b"".join(out)
+
+
+def save_game(sim, path):
+    # najpierw plik obok, potem podmiana - przerwany zapis nie psuje poprzedniego
+    data = encode(sim)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+# -------------------- ODCZYT --------------------
+
+def _records(layout, data, off, count):
+    end = off + layout.size * count
+    if end > len(data):
+        raise SaveError("plik zapisu jest ucięty")
+    return layout.iter_unpack(data[off:end]), end
+
+
+def _sprite_for(code, wm):
+    if code == SPRITE_BOSS:
+        return wm.boss_sprite
+    if 0 <= code < len(wm.enemy_sprites):
+        return wm.enemy_sprites[code]
+    return None
+
+
+def _load_enemies(sim, data, off, count):
+    wm = sim.wave_manager
+    enemies = []
+    records, off = _records(_ENEMY, data, off, count)
+    for (boss, sprite, alive, reached, counted, kill_used, wp_idx, reward, damage_to_base, hp_max,
+         hp, base_speed, speed, slow_factor, slow_timer, distance, x, y, prev_x, prev_y, radius, bob,
+         kill_cd, kill_timer) in records:
+        if boss:
+            e = BossEnemy.acquire(sim.waypoints, hp_max, base_speed, reward, damage_to_base, kill_cd)
+            e.tower_kill_timer = kill_timer
+            e.used_tower_kill = kill_used
+        else:
+            e = Enemy.acquire(sim.waypoints, hp_max, base_speed, reward, damage_to_base)
+        sprite = _sprite_for(sprite, wm)
+        if sprite is not None:
+            e.set_sprite(sprite)
+        e.hp, e.speed, e.slow_factor, e.slow_timer = hp, speed, slow_factor, slow_timer
+        e.distance, e.wp_idx, e.radius, e._bob_t = distance, wp_idx, radius, bob
+        e.pos.update(x, y)
+        e.prev_x, e.prev_y = prev_x, prev_y
+        e.alive, e.reached_base, e._counted = alive, reached, counted
+        sim.enemies.append(e)
+        enemies.append(e)
+    return enemies, off
+
+
+def _load_store(sim, data, off, count):
+    # EnemyStore: rekordy czytane wprost jako tablica strukturalna i kopiowane kolumnami
+    end = off + _ENEMY.size * count
+    if end > len(data):
+        raise SaveError("plik zapisu jest ucięty")
+    rec = np.frombuffer(data, dtype=_ENEMY_DTYPE, count=count, offset=off)
+    wm = sim.wave_manager
+    sprites = [_sprite_for(code, wm) for code in rec["sprite"].tolist()]
+    columns = {name: rec[name] for name, _ in ENEMY_FIELDS if name != "sprite"}
+    return sim.store.extend(columns, sprites), end
+
+
+def decode(data, enemy_sprites=None, boss_sprite=None, tower_sprites=None):
+    # każdy uszkodzony lub ucięty plik kończy się SaveError, nie wyjątkiem z struct/indeksu
+    try:
+        return _decode(data, enemy_sprites, boss_sprite, tower_sprites)
+    except SaveError:
+        raise
+    except (struct.error, IndexError, KeyError, ValueError, OverflowError) as e:
+        raise SaveError(f"uszkodzony plik zapisu: {e}") from e
+
+
+def _decode(data, enemy_sprites, boss_sprite, tower_sprites):
+    if len(data) < _HEADER.size:
+        raise SaveError("plik zapisu jest ucięty")
+    magic, version, seed, dt, backend = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise SaveError("to nie jest plik zapisu gry")
+    if version != VERSION:
+        raise SaveError(f"nieobsługiwana wersja zapisu: {version}")
+    if not 0 < dt <= 1.0:
+        raise SaveError(f"nieprawidłowy krok symulacji: {dt}")
+    backend = BACKENDS[backend]
+    if backend == "numpy" and np is None:
+        raise SaveError("zapis z backendu numpy, a pakiet numpy nie jest zainstalowany")
+
+    sim = Simulation(WAYPOINTS, enemy_sprites=enemy_sprites, boss_sprite=boss_sprite,
+                     tower_sprites=tower_sprites, dt=dt, enemy_backend=backend, seed=seed)
+    off = _HEADER.size
+
+    sim.tick, sim.time, sim.base_hp, sim.credits, sim.score, sim.game_over = _STATE.unpack_from(data, off)
+    off += _STATE.size
+    wm = sim.wave_manager
+    wm.wave, wm.time, wm.active, n_events = _WAVE.unpack_from(data, off)
+    off += _WAVE.size
+    records, off = _records(_SPAWN, data, off, n_events)
+    wm.timeline = [(row[0], i, SpawnEvent(*row)) for i, row in enumerate(records)]
+    heapq.heapify(wm.timeline)
+    n_towers, n_enemies, n_bullets, n_beams, n_streams = _COUNTS.unpack_from(data, off)
+    off += _COUNTS.size
+
+    for _ in range(n_streams):
+        n = data[off]
+        name = data[off + 1:off + 1 + n].decode("utf-8")
+        off += 1 + n
+        state = _RNG.unpack_from(data, off)
+        off += _RNG.size
+        sim.rng[name].setstate((3, state[:625], state[626] if state[625] else None))
+
+    records, off = _records(_TOWER, data, off, n_towers)
+    sim.timers.now = sim.time
+    for mode, level, x, y, rng_, cooldown, damage, bullet_speed, ready_at, anim, slow_f, slow_d in records:
+        name = TOWER_MODES[mode]
+        t = TOWER_TYPES[name]((x, y), sprite=sim.tower_sprites.get(name))
+        t.level = level
+        t.range, t.cooldown, t.damage, t.bullet_speed, t.ready_at, t._anim_t = rng_, cooldown, damage, bullet_speed, ready_at, anim
+        if hasattr(t, "slow_factor"):
+            t.slow_factor, t.slow_duration = slow_f, slow_d
+        sim.add_tower(t)
+
+    if sim.store is not None:
+        enemies, off = _load_store(sim, data, off, n_enemies)
+    else:
+        enemies, off = _load_enemies(sim, data, off, n_enemies)
+
+    records, off = _records(_BULLET, data, off, n_bullets)
+    for kind, target, has_slow, x, y, prev_x, prev_y, speed, dmg, radius, t, slow_f, slow_d in records:
+        b = Bullet.acquire((x, y), enemies[target] if target >= 0 else None, speed, dmg,
+                           kind=BULLET_KINDS[kind], radius=radius, slow=(slow_f, slow_d) if has_slow else None)
+        b.prev.update(prev_x, prev_y)
+        b._t = t
+        sim.bullets.append(b)
+
+    records, off = _records(_BEAM, data, off, n_beams)
+    for target, x, y, dmg, expires_at in records:
+        # bez celu w reset(), żeby wczytanie nie zadało obrażeń drugi raz
+        b = Beam.acquire((x, y), None, dmg, duration=0.0, now=expires_at)
+        if target >= 0:
+            b.target = enemies[target]
+            b.target_handle = b.target.handle
+        sim.beams.append(b)
+        sim.timers.schedule(expires_at, b)
+
+    return sim
+
+
+def load_game(path, enemy_sprites=None, boss_sprite=None, tower_sprites=None):
+    with open(path, "rb") as f:
+        return decode(f.read(), enemy_sprites, boss_sprite, tower_sprites)
@@ -0,0 +1,368 @@
+import pygame
+
+from map_data import SCREEN_W, SCREEN_H, WAYPOINTS, get_build_mask
+from entities import LaserTower, CannonTower, SlowTower
+from wave import WaveManager
+from spatial import EnemyGrid, TowerGrid
+from enemy_store import EnemyStore
+from projectile_store import ProjectileStore
+from registry import EntityRegistry
+from rng import RandomStreams
+from timers import TimerQueue, countdown
+
+TOWER_TYPES = {
+    "Laser": LaserTower,
+    "Cannon": CannonTower,
+    "Slow": SlowTower,
+}
+
+
+def _alive(obj):
+    return obj.alive
+
+
+def _release(obj):
+    obj.release()
+
+
+# Stan i reguły rozgrywki bez okna, fontów i sprite'ów.
+# Game tylko ją opakowuje (wejście + rysowanie), więc te same reguły
+# można liczyć headless ze stałym krokiem dt (balans fal, testy regresji).
+class Simulation:
+    DT = 1.0 / 60.0
+    START_BASE_HP = 25
+    START_CREDITS = 120
+    MIN_TOWER_SPACING = 36
+
+    def __init__(self, waypoints=WAYPOINTS, enemy_sprites=None, boss_sprite=None, tower_sprites=None, dt=DT,
+                 enemy_backend="objects", seed=None):
+        self.waypoints = waypoints
+        self.dt = float(dt)
+        self.tower_sprites = tower_sprites or {}
+
+        # "objects" - listy obiektów Enemy/Bullet,
+        # "numpy" - EnemyStore + ProjectileStore (tablice numpy)
+        self.enemy_backend = enemy_backend
+        if enemy_backend == "numpy":
+            self.store = EnemyStore(waypoints)
+            self.projectiles = ProjectileStore(self.store)
+        elif enemy_backend == "objects":
+            self.store = None
+            self.projectiles = None
+        else:
+            raise ValueError(f"Nieznany backend przeciwników: {enemy_backend}")
+
+        # ziarno gry; cała losowość idzie z nazwanych strumieni (powtórki, testy)
+        self.rng = RandomStreams(seed)
+        self.seed = self.rng.seed
+
+        # nagrywanie komend gracza do powtórki (replay.ReplayRecorder)
+        self.recorder = None
+
+        # obiekty
+        # rejestry z uchwytami generacyjnymi: usuwanie O(1), bez przebudowy list
+        self.enemies = EntityRegistry() if self.store is None else self.store
+        self.towers = EntityRegistry()
+        self.bullets = EntityRegistry() if self.projectiles is None else self.projectiles
+        self.beams = EntityRegistry()
+
+        # stan rozgrywki
+        self.base_hp = self.START_BASE_HP
+        self.credits = self.START_CREDITS
+        self.score = 0
+        self.game_over = False
+        # przeciwnicy, którzy doszli do bazy (statystyka, nie trafia do zapisu)
+        self.leaked = 0
+
+        self.tick = 0
+        self.time = 0.0
+
+        # indeks przestrzenny przeciwników, przebudowywany co tick
+        self.grid = EnemyGrid()
+
+        # terminy (koniec przeładowania wieży, koniec promienia) zamiast liczników co tick;
+        # gotowe wieże czekają w ready_towers, aż przeciwnik wejdzie w pokrywane przez nie komórki
+        self.timers = TimerQueue()
+        self.ready_towers = set()
+        self._tower_cover = None
+
+        # FrameProfiler z Game, gdy nakładka profilera jest włączona
+        self.profiler = None
+
+        # wieże zniszczone przez bossa w ostatnim kroku
+        self.destroyed_towers = []
+
+        # blokada budowy
+        self.base_rect = pygame.Rect(SCREEN_W - 110, SCREEN_H // 2 - 70, 90, 140)
+
+        # budowalność terenu (ścieżka + baza) z góry, wieże w siatce zajętości
+        self.build_mask = get_build_mask(waypoints, (SCREEN_W, SCREEN_H), (self.base_rect,))
+        self.tower_grid = TowerGrid(self.MIN_TOWER_SPACING)
+
+        self.wave_manager = WaveManager(
+            waypoints,
+            enemy_sprites=enemy_sprites,
+            boss_sprite=boss_sprite,
+            rng=self.rng["enemies"]
+        )
+
+    # -------------------- KOMENDY GRACZA --------------------
+
+    def is_wave_finished(self):
+        if self.store is not None:
+            # bez iterowania widoków po całym magazynie
+            return not self.wave_manager.timeline and not self.store.alive.any()
+        return self.wave_manager.is_wave_finished(self.enemies)
+
+    def start_next_wave(self):
+        if not self.is_wave_finished():
+            return False
+        self.wave_manager.start_next_wave()
+        if self.recorder is not None:
+            self.recorder.record(self.tick, "wave")
+        return True
+
+    def tower_at(self, pos):
+        # najbliższa wieża pod kursorem
+        mx, my = pos
+        best = None
+        best_d2 = None
+        for t in self.tower_grid.query(mx, my, self.tower_grid.max_radius + 6):
+            d2 = (t.pos.x - mx) ** 2 + (t.pos.y - my) ** 2
+            if d2 <= (t.radius + 6) ** 2 and (best is None or d2 < best_d2):
+                best = t
+                best_d2 = d2
+        return best
+
+    def is_too_close_to_other_tower(self, pos):
+        px, py = pos
+        for t in self.tower_grid.query(px, py, self.MIN_TOWER_SPACING):
+            if (t.pos.x - px) ** 2 + (t.pos.y - py) ** 2 < self.MIN_TOWER_SPACING ** 2:
+                return True
+        return False
+
+    def can_build(self, pos):
+        if not self.build_mask.buildable(pos):
+            return False
+        if self.is_too_close_to_other_tower(pos):
+            return False
+        return True
+
+    def try_build_tower(self, pos, mode):
+        cls = TOWER_TYPES.get(mode)
+        if cls is None or self.credits < cls.COST:
+            return None
+        self.credits -= cls.COST
+        tower = cls(pos, sprite=self.tower_sprites.get(mode), rng=self.rng["towers"])
+        self.add_tower(tower)
+        if self.recorder is not None:
+            self.recorder.record(self.tick, "build", mode, pos[0], pos[1])
+        return tower
+
+    def try_upgrade(self, tower):
+        if tower is None or not tower.can_upgrade():
+            return False
+        cost = tower.upgrade_cost()
+        if self.credits < cost:
+            return False
+        self.credits -= cost
+        tower.upgrade()
+        self.towers_changed()
+        if self.recorder is not None:
+            self.recorder.record(self.tick, "upgrade", tower.pos.x, tower.pos.y)
+        return True
+
+    # -------------------- WIEŻE --------------------
+
+    def add_tower(self, tower):
+        self.towers.append(tower)
+        self.tower_grid.add(tower)
+        if tower.ready_at <= self.time:
+            self.ready_towers.add(tower)
+        else:
+            self.timers.schedule(tower.ready_at, tower)
+        self.towers_changed()
+
+    def towers_changed(self):
+        # po budowie, zniszczeniu albo zmianie zasięgu wieży
+        self._tower_cover = None
+
+    def _build_tower_cover(self):
+        # komórka siatki przeciwników -> wieże, których zasięg na nią zachodzi,
+        # i odwrotnie: wieża -> jej komórki
+        by_cell = {}
+        by_tower = {}
+        for t in self.towers:
+            keys = by_tower[t] = self.grid.cells_in_circle(t.pos.x, t.pos.y, t.range)
+            for key in keys:
+                by_cell.setdefault(key, []).append(t)
+        return by_cell, by_tower
+
+    # -------------------- KROK SYMULACJI --------------------
+
+    def step(self, dt=None):
+        if self.game_over:
+            return
+        if dt is None:
+            dt = self.dt
+
+        self.tick += 1
+        self.time += dt
+        self.destroyed_towers = []
+        prof = self.profiler
+
+        for obj in self.timers.pop_due(self.time, dt):
+            obj.on_timer(self)
+        if prof is not None:
+            prof.mark("timery")
+
+        self.update_enemies(dt)
+        if prof is not None:
+            prof.mark("ruch")
+        self.wave_manager.update(dt, self.enemies)
+        if prof is not None:
+            prof.mark("fale")
+        self.boss_attacks()
+        if prof is not None:
+            prof.mark("boss")
+        self.base_hits()
+        if prof is not None:
+            prof.mark("baza")
+        self.update_towers(dt)
+        if prof is not None:
+            prof.mark("wieże")
+
+        self.update_bullets(dt)
+        if prof is not None:
+            prof.mark("pociski")
+
+        self.collect_rewards()
+        if prof is not None:
+            prof.mark("nagrody")
+        self.compact()
+        if prof is not None:
+            prof.mark("sprzątanie")
+
+        if self.base_hp <= 0:
+            self.base_hp = 0
+            self.game_over = True
+
+    def update_enemies(self, dt):
+        if self.store is not None:
+            self.store.update(dt)
+            return
+        for e in self.enemies:
+            e.update(dt)
+
+    def boss_attacks(self):
+        if self.store is not None:
+            to_remove = self.store.try_destroy_random_tower(self.towers, self.rng["boss"])
+        else:
+            to_remove = []
+            for e in self.enemies:
+                if hasattr(e, "try_destroy_random_tower"):
+                    victim = e.try_destroy_random_tower(self.towers, self.rng["boss"])
+                    if victim is not None:
+                        to_remove.append(victim)
+
+        if to_remove:
+            for t in to_remove:
+                self.towers.remove(t)
+                self.tower_grid.remove(t)
+                self.ready_towers.discard(t)
+            self.towers_changed()
+            self.destroyed_towers = to_remove
+
+    def base_hits(self):
+        if self.store is not None:
+            damage, count = self.store.collect_leaks()
+            self.base_hp -= damage
+            self.leaked += count
+            return
+        for e in self.enemies:
+            if (not e.alive) and e.reached_base:
+                self.base_hp -= getattr(e, "damage_to_base", 1)
+                self.leaked += 1
+                e.reached_base = False
+
+    def update_towers(self, dt):
+        # strzelają tylko gotowe wieże z przeciwnikiem w pokrywanych komórkach,
+        # wieże w przeładowaniu śpią w self.timers - bezczynna wieża nic nie kosztuje
+        ready = self.ready_towers
+        if not ready:
+            return
+        # wieże pytają indeks: siatkę dla obiektów albo wektorowo sam EnemyStore
+        if self.store is not None:
+            index = self.store
+            occupied = self.store.occupied_cells(self.grid.cell_size)
+        else:
+            self.grid.rebuild(self.enemies)
+            index = self.grid
+            occupied = self.grid.occupied
+        if not occupied:
+            return
+
+        cover = self._tower_cover
+        if cover is None:
+            cover = self._tower_cover = self._build_tower_cover()
+        by_cell, by_tower = cover
+
+        # wieże do sprawdzenia, w kolejności rejestru (jak przy przechodzeniu wszystkich):
+        # przy kilku zajętych komórkach od strony komórek, przy tłoku od strony wież
+        if len(occupied) < len(ready):
+            awake = set()
+            for key in occupied:
+                towers = by_cell.get(key)
+                if towers:
+                    awake.update(towers)
+            awake = sorted(awake & ready, key=self.towers.index_of)
+        else:
+            occupied = set(occupied)
+            awake = [t for t in self.towers if t in ready and not occupied.isdisjoint(by_tower[t])]
+
+        timers = self.timers
+        for t in awake:
+            if t.try_shoot(self.enemies, self.bullets, self.beams, index, timers):
+                ready.discard(t)
+                t.ready_at = self.time + countdown(t.cooldown, dt)
+                timers.schedule(t.ready_at, t)
+
+    def update_bullets(self, dt):
+        if self.projectiles is not None:
+            self.projectiles.update(dt)
+            return
+        for b in self.bullets:
+            b.update(dt)
+
+    def collect_rewards(self):
+        if self.store is not None:
+            reward, kills = self.store.collect_kills()
+            self.credits += reward
+            self.score += kills
+            return
+        for e in self.enemies:
+            if (not e.alive) and (not e.reached_base) and (e.hp <= 0):
+                if getattr(e, "_counted", False) is False:
+                    e._counted = True
+                    self.credits += e.reward
+                    self.score += 1
+
+    def compact(self):
+        # pociski z martwym celem same giną w następnym update (uchwyt celu jest nieważny)
+        if self.projectiles is None:
+            self.bullets.compact(_alive, _release)
+        self.beams.compact(_alive, _release)
+        if self.store is not None:
+            self.store.compact()
+        else:
+            self.enemies.compact(_alive, _release)
+
+    def run_wave(self, max_ticks=60 * 60 * 10):
+        # startuje następną falę i liczy ją do końca (albo do przegranej)
+        if not self.start_next_wave():
+            return False
+        for _ in range(max_ticks):
+            self.step()
+            if self.game_over or self.is_wave_finished():
+                break
+        return not self.game_over
@@ -0,0 +1,134 @@
+from math import sqrt
+
+# Siatka (spatial hash) żywych przeciwników do szybkich zapytań o zasięg.
+# Budowana raz na tick, wieże sprawdzają tylko komórki pokrywane przez swój
+# zasięg zamiast całej listy przeciwników.
+class EnemyGrid:
+    def __init__(self, cell_size=64):
+        self.cell_size = int(cell_size)
+        self.cells = {}
+        # niepuste komórki z ostatniej przebudowy
+        self.occupied = []
+        # bufor wyników zapytania, używany ponownie zamiast nowej listy co wywołanie
+        self._out = []
+
+    def rebuild(self, enemies):
+        # kubełki zostają między tickami, tylko je czyścimy
+        cs = self.cell_size
+        cells = self.cells
+        for bucket in cells.values():
+            bucket.clear()
+        occupied = self.occupied
+        occupied.clear()
+        for e in enemies:
+            if not e.alive:
+                continue
+            key = (int(e.pos.x) // cs, int(e.pos.y) // cs)
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [e]
+                occupied.append(key)
+            else:
+                if not bucket:
+                    occupied.append(key)
+                bucket.append(e)
+
+    def cells_in_circle(self, x, y, r):
+        # te same komórki, które przegląda query(x, y, r)
+        cs = self.cell_size
+        keys = []
+        for cx in range(int(x - r) // cs, int(x + r) // cs + 1):
+            left = cx * cs
+            dx = max(0.0, left - x, x - (left + cs))
+            if dx > r:
+                continue
+            half = sqrt(r * r - dx * dx)
+            for cy in range(int(y - half) // cs, int(y + half) // cs + 1):
+                keys.append((cx, cy))
+        return keys
+
+    def query(self, x, y, r):
+        # kandydaci tylko z komórek, które faktycznie nachodzą na okrąg;
+        # zwracana lista jest ważna do następnego zapytania
+        cs = self.cell_size
+        cells = self.cells
+        r2 = r * r
+        out = self._out
+        out.clear()
+        for cx in range(int(x - r) // cs, int(x + r) // cs + 1):
+            left = cx * cs
+            dx = max(0.0, left - x, x - (left + cs))
+            if dx > r:
+                continue
+            half = sqrt(r2 - dx * dx)
+            for cy in range(int(y - half) // cs, int(y + half) // cs + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    out.extend(bucket)
+        return out
+
+    def best_in_range(self, x, y, r):
+        # najdalej na ścieżce przeciwnik w zasięgu (porównanie kwadratów odległości)
+        r2 = r * r
+        best = None
+        best_prog = -1e9
+        for e in self.query(x, y, r):
+            if not e.alive:
+                continue
+            dx = e.pos.x - x
+            dy = e.pos.y - y
+            if dx * dx + dy * dy <= r2:
+                if e.progress > best_prog:
+                    best_prog = e.progress
+                    best = e
+        return best
+
+
+# Siatka zajętości wież, aktualizowana przy budowie i zniszczeniu wieży.
+# Sprawdzenie odstępu przy budowie i wybór wieży kliknięciem patrzą tylko
+# na kilka sąsiednich komórek zamiast na wszystkie wieże.
+class TowerGrid:
+    def __init__(self, cell_size=36):
+        self.cell_size = int(cell_size)
+        self.cells = {}
+        # największy promień wieży, potrzebny przy trafianiu kliknięciem
+        self.max_radius = 0
+        self._out = []
+
+    def _key(self, tower):
+        cs = self.cell_size
+        return (int(tower.pos.x) // cs, int(tower.pos.y) // cs)
+
+    def add(self, tower):
+        key = self._key(tower)
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [tower]
+        else:
+            bucket.append(tower)
+        self.max_radius = max(self.max_radius, tower.radius)
+
+    def remove(self, tower):
+        bucket = self.cells.get(self._key(tower))
+        if bucket and tower in bucket:
+            bucket.remove(tower)
+
+    def rebuild(self, towers):
+        self.cells.clear()
+        self.max_radius = 0
+        for t in towers:
+            self.add(t)
+
+    def query(self, x, y, r):
+        # kandydaci z komórek nachodzących na kwadrat wokół okręgu;
+        # zwracana lista jest ważna do następnego zapytania
+        cs = self.cell_size
+        cells = self.cells
+        out = self._out
+        out.clear()
+        for cx in range(int(x - r) // cs, int(x + r) // cs + 1):
+            for cy in range(int(y - r) // cs, int(y + r) // cs + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    out.extend(bucket)
+        return out
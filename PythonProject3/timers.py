@@ -0,0 +1,65 @@
+import heapq
+import math
+from functools import lru_cache
+
+# tolerancja porównania czasu symulacji (suma wielu kroków dt)
+EPS = 1e-9
+
+
+# powyżej tylu kroków odliczanie liczone jest arytmetycznie: koszt stały także przy
+# absurdalnie małym dt (np. z uszkodzonego pliku), różnica zaokrągleń najwyżej jeden krok
+COUNTDOWN_LOOP_STEPS = 4096
+
+
+@lru_cache(maxsize=256)
+def countdown(duration, dt):
+    # czas trwania odliczania "timer -= dt co tick aż do <= 0" (k kroków po dt);
+    # terminy z tego mają ten sam takt co dawne liczniki, łącznie z zaokrągleniami
+    # (0.2 przy dt 1/60 to 13 kroków, nie 12)
+    if not dt > 0 or not math.isfinite(duration):
+        return duration
+    if duration > dt * COUNTDOWN_LOOP_STEPS:
+        steps = math.ceil(duration / dt)
+        if steps * dt < duration:
+            steps += 1
+        elif (steps - 1) * dt >= duration:
+            steps -= 1
+        return steps * dt
+    timer = duration
+    steps = 0
+    while timer > 0:
+        timer -= dt
+        steps += 1
+    return steps * dt
+
+
+# Wspólna kolejka terminów symulacji: kopiec (czas, nr, obiekt) po czasie gry.
+# Obiekt jest budzony (on_timer) dopiero gdy jego termin minie, zamiast
+# odliczać swój licznik co tick. Wpisy nie są usuwane przy zmianie terminu -
+# on_timer sam sprawdza, czy termin jest nadal aktualny.
+class TimerQueue:
+    def __init__(self):
+        self.now = 0.0
+        # dt bieżącego kroku, do liczenia terminów przez countdown()
+        self.dt = 0.0
+        self._heap = []
+        self._seq = 0
+
+    def schedule(self, when, obj):
+        self._seq += 1
+        heapq.heappush(self._heap, (when, self._seq, obj))
+
+    def pop_due(self, now, dt=0.0):
+        self.now = now
+        self.dt = dt
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= now + EPS:
+            due.append(heapq.heappop(heap)[2])
+        return due
+
+    def clear(self):
+        self._heap.clear()
+
+    def __len__(self):
+        return len(self._heap)
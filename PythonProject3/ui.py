@@ -1,5 +1,51 @@
+from collections import OrderedDict
+
 import pygame
 
+
+# Cache wyrenderowanych napisów (font, tekst, kolor) z wyrzucaniem LRU.
+# Napisy, które się nie zmieniają, są renderowane tylko raz.
+class TextCache:
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            return surf
+        surf = font.render(text, antialias, color)
+        self._surfaces[key] = surf
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+
+TEXT_CACHE = TextCache()
+_HUD_CACHE = None
+_OVERLAYS = {}
+_GHOSTS = {}
+
+
+def get_overlay(size, color=(0, 0, 0, 170)):
+    # półprzezroczysta nakładka na cały ekran, tworzona raz na rozmiar i kolor
+    key = (size, color)
+    overlay = _OVERLAYS.get(key)
+    if overlay is None:
+        overlay = pygame.Surface(size, pygame.SRCALPHA)
+        overlay.fill(color)
+        _OVERLAYS[key] = overlay
+    return overlay
+
+
 class Button:
     def __init__(self, rect, text):
         self.rect = pygame.Rect(rect)
@@ -19,10 +65,26 @@ class Button:
         pygame.draw.rect(screen, bg, self.rect, border_radius=10)
         pygame.draw.rect(screen, (160, 160, 220), self.rect, 2, border_radius=10)
 
-        surf = font.render(self.text, True, (235, 235, 255))
+        surf = TEXT_CACHE.render(font, self.text, (235, 235, 255))
         screen.blit(surf, (self.rect.centerx - surf.get_width()//2, self.rect.centery - surf.get_height()//2))
 
-def draw_hud(screen, font, small_font, wave, hp, credits, score, highscore, selected_tower, build_mode):
+def draw_hud(screen, font, small_font, wave, hp, credits, score, highscore, selected_tower, build_mode,
+             next_wave=None):
+    global _HUD_CACHE
+
+    # napisy HUD są budowane od nowa tylko gdy zmieni się któraś z wartości
+    t = selected_tower
+    tower_key = None if t is None else (t.NAME, t.level, t.damage, t.range, t.cooldown)
+    key = (font, small_font, screen.get_height(), wave, hp, credits, score, highscore, tower_key, build_mode, next_wave)
+    if _HUD_CACHE is None or _HUD_CACHE[0] != key:
+        _HUD_CACHE = (key, _build_hud(screen, font, small_font, wave, hp, credits, score, highscore, t, build_mode,
+                                      next_wave))
+
+    return screen.blits(_HUD_CACHE[1])
+
+def _build_hud(screen, font, small_font, wave, hp, credits, score, highscore, selected_tower, build_mode,
+               next_wave=None):
+    blits = []
     x, y = 14, 12
     lines = [
         f"Fala: {wave}",
@@ -31,34 +93,77 @@ def draw_hud(screen, font, small_font, wave, hp, credits, score, highscore, sele
         f"Wynik: {score}   (Highscore: {highscore})",
     ]
     for i, t in enumerate(lines):
-        surf = font.render(t, True, (235, 235, 255))
-        screen.blit(surf, (x, y + i*26))
+        surf = TEXT_CACHE.render(font, t, (235, 235, 255))
+        blits.append((surf, (x, y + i*26)))
 
-    tip = "1 Laser (60) | 2 Cannon (85) | 3 Slow (70) | U - ulepsz zazn. | PPM - odznacz | Spacja - next wave"
+    tip = "1 Laser (60) | 2 Cannon (85) | 3 Slow (70) | U - ulepsz zazn. | PPM - odznacz | Spacja - next wave | F - x2/x4/x8"
     tip2 = "Tryb budowy: " + (build_mode if build_mode else "brak")
-    surf_tip = small_font.render(tip, True, (170, 170, 210))
-    screen.blit(surf_tip, (14, screen.get_height() - 44))
-    surf_tip2 = small_font.render(tip2, True, (170, 170, 210))
-    screen.blit(surf_tip2, (14, screen.get_height() - 22))
+    surf_tip = TEXT_CACHE.render(small_font, tip, (170, 170, 210))
+    blits.append((surf_tip, (14, screen.get_height() - 44)))
+    surf_tip2 = TEXT_CACHE.render(small_font, tip2, (170, 170, 210))
+    blits.append((surf_tip2, (14, screen.get_height() - 22)))
+
+    # podgląd następnej fali z jej harmonogramu (WaveManager.preview)
+    if next_wave is not None:
+        enemies, bosses, hp_total, _ = next_wave
+        parts = [f"{enemies} wrogów"] if enemies else []
+        if bosses:
+            parts.append("boss" if bosses == 1 else f"{bosses} bossów")
+        text = f"Następna fala: {' + '.join(parts)} (łącznie {hp_total:.0f} hp)"
+        blits.append((TEXT_CACHE.render(small_font, text, (200, 200, 140)), (14, screen.get_height() - 66)))
 
     if selected_tower is not None:
         t = selected_tower
         info = f"Zaznaczona: {t.NAME} | lvl {t.level} | dmg {t.damage:.1f} | rng {t.range:.0f} | cd {t.cooldown:.2f}"
-        surf = small_font.render(info, True, (210, 210, 255))
-        screen.blit(surf, (14, 122))
+        surf = TEXT_CACHE.render(small_font, info, (210, 210, 255))
+        blits.append((surf, (14, 122)))
+    return blits
+
+def draw_placement_ghost(screen, pos, radius, ok):
+    # podgląd stawianej wieży pod kursorem: zielony gdy można budować, czerwony gdy nie
+    key = (radius, ok)
+    ghost = _GHOSTS.get(key)
+    if ghost is None:
+        color = (80, 220, 120) if ok else (230, 70, 70)
+        ghost = pygame.Surface((radius * 2 + 2, radius * 2 + 2), pygame.SRCALPHA)
+        pygame.draw.circle(ghost, color + (90,), (radius + 1, radius + 1), radius)
+        pygame.draw.circle(ghost, color + (200,), (radius + 1, radius + 1), radius, 2)
+        _GHOSTS[key] = ghost
+    return screen.blit(ghost, ghost.get_rect(center=pos))
+
+def draw_speed(screen, font, scale, effective):
+    # wskaźnik przyspieszenia w prawym dolnym rogu; na czerwono, gdy procesor nie nadąża
+    lagging = effective < scale * 0.9
+    text = f">> x{scale}" + (f" (x{effective:.1f})" if lagging else "")
+    surf = TEXT_CACHE.render(font, text, (240, 110, 110) if lagging else (170, 230, 170))
+    return screen.blit(surf, (screen.get_width() - surf.get_width() - 14, screen.get_height() - 22))
+
+def render_panel(font, lines, color=(220, 230, 255)):
+    # półprzezroczysty panel z kilkoma liniami tekstu (nakładka profilera);
+    # treść zmienia się co chwilę, więc bez TEXT_CACHE
+    surfs = [font.render(line, True, color) for line in lines]
+    w = max(s.get_width() for s in surfs) + 16
+    h = sum(s.get_height() for s in surfs) + 12
+    panel = pygame.Surface((w, h), pygame.SRCALPHA)
+    panel.fill((0, 0, 0, 180))
+    y = 6
+    for surf in surfs:
+        panel.blit(surf, (8, y))
+        y += surf.get_height()
+    return panel
 
 def draw_game_over(screen, font, big_font, score, highscore):
     w, h = screen.get_size()
-    overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 170))
-    screen.blit(overlay, (0, 0))
+    rect = screen.blit(get_overlay((w, h)), (0, 0))
 
-    t1 = big_font.render("GAME OVER", True, (255, 255, 255))
-    t2 = font.render(f"Wynik: {score}", True, (235, 235, 255))
-    t3 = font.render(f"Highscore: {highscore}", True, (235, 235, 255))
-    t4 = font.render("Naciśnij R aby zrestartować, ESC aby wyjść", True, (200, 200, 230))
+    t1 = TEXT_CACHE.render(big_font, "GAME OVER", (255, 255, 255))
+    t2 = TEXT_CACHE.render(font, f"Wynik: {score}", (235, 235, 255))
+    t3 = TEXT_CACHE.render(font, f"Highscore: {highscore}", (235, 235, 255))
+    t4 = TEXT_CACHE.render(font, "Naciśnij R aby zrestartować, ESC aby wyjść", (200, 200, 230))
 
     screen.blit(t1, (w//2 - t1.get_width()//2, 220))
     screen.blit(t2, (w//2 - t2.get_width()//2, 310))
     screen.blit(t3, (w//2 - t3.get_width()//2, 345))
     screen.blit(t4, (w//2 - t4.get_width()//2, 395))
+
+    return rect
@@ -1,92 +1,182 @@
+import heapq
+import random
+
 from entities import Enemy, BossEnemy
 
+# kod sprite'a w zdarzeniu: indeks w enemy_sprites albo jedna z tych wartości
+SPRITE_NONE = -1
+SPRITE_BOSS = -2
+
+
+class SpawnEvent:
+    # jeden przeciwnik w harmonogramie fali (czas liczony od startu fali)
+    __slots__ = ("time", "boss", "hp", "speed", "reward", "damage_to_base", "tower_kill_cd", "sprite")
+
+    def __init__(self, time, boss, hp, speed, reward, damage_to_base, tower_kill_cd=0.0, sprite=SPRITE_NONE):
+        self.time = time
+        self.boss = boss
+        self.hp = hp
+        self.speed = speed
+        self.reward = reward
+        self.damage_to_base = damage_to_base
+        self.tower_kill_cd = tower_kill_cd
+        self.sprite = sprite
+
+    def __repr__(self):
+        kind = "boss" if self.boss else "wróg"
+        return f"<{kind} t={self.time:.2f} hp={self.hp} speed={self.speed} reward={self.reward}>"
+
+
 class WaveManager:
-    def __init__(self, waypoints, enemy_sprites=None, boss_sprite=None):
+    # balans fal; balance_sweep.py nadpisuje te wartości na instancji
+    ENEMIES_BASE = 6
+    ENEMIES_PER_WAVE = 2
+    ENEMY_HP = 20
+    ENEMY_HP_PER_WAVE = 6
+    ENEMY_SPEED = 85
+    ENEMY_SPEED_PER_WAVE = 2
+    ENEMY_REWARD = 8
+    ENEMY_REWARD_WAVE_DIV = 2
+    SPAWN_DELAY = 0.2
+    SPAWN_INTERVAL = 0.65
+    SPAWN_INTERVAL_MIN = 0.35
+    SPAWN_INTERVAL_STEP = 0.01
+
+    BOSS_EVERY = 3
+    BOSS_HP = 180
+    BOSS_HP_PER_WAVE = 40
+    BOSS_SPEED = 70
+    BOSS_SPEED_PER_WAVE = 1
+    BOSS_REWARD = 60
+    BOSS_REWARD_PER_WAVE = 5
+    BOSS_DAMAGE = 5
+    BOSS_TOWER_KILL_CD = 5.0
+    # eskorta idąca za bossem (zwykli przeciwnicy tej fali), 0 = sam boss
+    BOSS_ESCORTS = 0
+
+    def __init__(self, waypoints, enemy_sprites=None, boss_sprite=None, rng=None):
         self.waypoints = waypoints
+        # strumień losowości dla nowych przeciwników
+        self.rng = rng or random
         self.enemy_sprites = enemy_sprites or []
         self.boss_sprite = boss_sprite
 
         self.wave = 0
-        self.to_spawn = 0
-        self.spawn_timer = 0.0
-        self.spawn_interval = 0.65
         self.active = False
-
-        self._boss_pending = False
-        self._boss_spawned = False
+        # czas od startu fali i kopiec (czas, nr, SpawnEvent) jeszcze niewypuszczonych przeciwników
+        self.time = 0.0
+        self.timeline = []
+        # (numer fali, wynik preview) - HUD pyta co klatkę między falami
+        self._preview = None
+
+    # -------------------- HARMONOGRAM --------------------
+
+    def spawn_interval(self, wave):
+        return max(self.SPAWN_INTERVAL_MIN, self.SPAWN_INTERVAL - wave * self.SPAWN_INTERVAL_STEP)
+
+    def _enemy_event(self, wave, time):
+        sprite = (wave - 1) % len(self.enemy_sprites) if self.enemy_sprites else SPRITE_NONE
+        return SpawnEvent(
+            time, False,
+            hp=self.ENEMY_HP + wave * self.ENEMY_HP_PER_WAVE,
+            speed=self.ENEMY_SPEED + wave * self.ENEMY_SPEED_PER_WAVE,
+            reward=self.ENEMY_REWARD + wave // self.ENEMY_REWARD_WAVE_DIV,
+            damage_to_base=1,
+            sprite=sprite,
+        )
+
+    def compile_wave(self, wave):
+        # cała fala z góry, posortowana po czasie - też do podglądu następnej fali
+        interval = self.spawn_interval(wave)
+        t = self.SPAWN_DELAY
+        events = []
+
+        # boss co BOSS_EVERY fal, opcjonalnie z eskortą
+        if wave % self.BOSS_EVERY == 0:
+            if self.boss_sprite is not None:
+                sprite = SPRITE_BOSS
+            else:
+                sprite = len(self.enemy_sprites) - 1 if self.enemy_sprites else SPRITE_NONE
+            events.append(SpawnEvent(
+                t, True,
+                hp=self.BOSS_HP + (wave * self.BOSS_HP_PER_WAVE),
+                speed=self.BOSS_SPEED + wave * self.BOSS_SPEED_PER_WAVE,
+                reward=self.BOSS_REWARD + wave * self.BOSS_REWARD_PER_WAVE,
+                damage_to_base=self.BOSS_DAMAGE,
+                tower_kill_cd=self.BOSS_TOWER_KILL_CD,
+                sprite=sprite,
+            ))
+            count = self.BOSS_ESCORTS
+            t += interval
+        else:
+            count = self.ENEMIES_BASE + wave * self.ENEMIES_PER_WAVE
+
+        for i in range(count):
+            events.append(self._enemy_event(wave, t + i * interval))
+        return events
+
+    def preview(self, wave=None):
+        # (liczba zwykłych, liczba bossów, łączne hp, czas spawnu) fali, domyślnie następnej
+        if wave is None:
+            wave = self.wave + 1
+        if self._preview is not None and self._preview[0] == wave:
+            return self._preview[1]
+        events = self.compile_wave(wave)
+        bosses = sum(1 for e in events if e.boss)
+        result = (len(events) - bosses, bosses, sum(e.hp for e in events), events[-1].time if events else 0.0)
+        self._preview = (wave, result)
+        return result
+
+    @property
+    def to_spawn(self):
+        return len(self.timeline)
 
     def start_next_wave(self):
         self.wave += 1
-
-        # boss co 3 fale
-        if self.wave % 3 == 0:
-            self._boss_pending = True
-            self._boss_spawned = False
-            self.to_spawn = 0
-        else:
-            self._boss_pending = False
-            self._boss_spawned = False
-            self.to_spawn = 6 + self.wave * 2
-
-        self.spawn_timer = 0.2
+        self.time = 0.0
+        self.timeline = [(e.time, i, e) for i, e in enumerate(self.compile_wave(self.wave))]
+        heapq.heapify(self.timeline)
         self.active = True
 
     def is_wave_finished(self, enemies):
-        if self.to_spawn > 0:
+        if self.timeline:
             return False
         return all(not e.alive for e in enemies)
 
-    def update(self, dt, enemies):
-        if not self.active:
-            return
-
-        self.spawn_timer -= dt
-        if self.spawn_timer > 0:
-            return
-
-
-        if self._boss_pending and not self._boss_spawned:
-            hp = 180 + (self.wave * 40)
-            speed = 70 + self.wave
-            reward = 60 + self.wave * 5
+    # -------------------- SPAWN --------------------
 
-            boss = BossEnemy(
+    def _spawn(self, event):
+        if event.boss:
+            e = BossEnemy.acquire(
                 self.waypoints,
-                hp=hp,
-                speed=speed,
-                reward=reward,
-                damage_to_base=5,
-                tower_kill_cd=5.0
+                hp=event.hp,
+                speed=event.speed,
+                reward=event.reward,
+                damage_to_base=event.damage_to_base,
+                tower_kill_cd=event.tower_kill_cd,
+                rng=self.rng
             )
+        else:
+            e = Enemy.acquire(self.waypoints, hp=event.hp, speed=event.speed, reward=event.reward,
+                              damage_to_base=event.damage_to_base, rng=self.rng)
 
-            if self.boss_sprite is not None:
-                boss.set_sprite(self.boss_sprite)
-            elif self.enemy_sprites:
-                boss.set_sprite(self.enemy_sprites[-1])
-
-            enemies.append(boss)
-            self._boss_spawned = True
-
-            # po spawnie bossa nie spawnuje potworkow
-            self.spawn_timer = 999999
-            return
-
+        if event.sprite == SPRITE_BOSS:
+            e.set_sprite(self.boss_sprite)
+        elif event.sprite >= 0:
+            e.set_sprite(self.enemy_sprites[event.sprite])
+        return e
 
-        if self.to_spawn <= 0:
+    def update(self, dt, enemies):
+        timeline = self.timeline
+        if not timeline:
             return
 
-        hp = 20 + self.wave * 6
-        speed = 85 + self.wave * 2
-        reward = 8 + self.wave // 2
-
-        e = Enemy(self.waypoints, hp=hp, speed=speed, reward=reward, damage_to_base=1)
-
-        if self.enemy_sprites:
-            sprite = self.enemy_sprites[(self.wave - 1) % len(self.enemy_sprites)]
-            e.set_sprite(sprite)
-
-        enemies.append(e)
-
-        self.to_spawn -= 1
-        self.spawn_interval = max(0.35, 0.65 - self.wave * 0.01)
-        self.spawn_timer = self.spawn_interval
+        # wszystkie zdarzenia, których czas minął - kilka naraz przy dużym dt;
+        # każdy nowy przeciwnik od razu przechodzi drogę za czas od swojego spawnu
+        # (Simulation woła to po ruchu przeciwników, więc nie dostaje już całego dt)
+        self.time += dt
+        while timeline and timeline[0][0] <= self.time:
+            event = heapq.heappop(timeline)[2]
+            e = self._spawn(event)
+            e.update(self.time - event.time)
+            enemies.append(e)